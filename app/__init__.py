@@ -4,9 +4,25 @@ import os
 def create_app():
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'your-secret-key-here'
-    app.config['UPLOAD_FOLDER'] = 'app/uploads'
-    app.config['REPORTS_FOLDER'] = 'app/reports'
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    # Relative to the working directory; docker-compose points both at the mounted volumes
+    app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'app/uploads')
+    app.config['REPORTS_FOLDER'] = os.getenv('REPORTS_FOLDER', 'app/reports')
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max request size
+    app.config['UPLOAD_CHUNK_SIZE'] = 8 * 1024 * 1024  # chunked upload unit (must stay below MAX_CONTENT_LENGTH)
+    app.config['TEXT_DIFF_BUDGET'] = {}  # per-record overrides of JSONAnalyzer.DEFAULT_TEXT_DIFF_BUDGET
+    app.config['TEXT_DIFF_MODE'] = 'character'  # 'token' for compact token-range diffs of long single-paragraph texts
+    app.config['TOKEN_CACHE_MAX_TOKENS'] = 5_000_000  # tokenizations kept across analyses per analysis process, keyed on text hash
+    app.config['MULTI_ANALYSIS_WORKERS'] = 4  # exports whose records are held in memory at once in N-way comparisons (threads, so no CPU parallelism)
+    app.config['ANALYSIS_EXECUTOR'] = os.getenv('ANALYSIS_EXECUTOR', 'thread')  # 'process' keeps analyses off the web process's GIL (wsgi.py default)
+    app.config['ANALYSIS_WORKERS'] = int(os.getenv('ANALYSIS_WORKERS', '2'))  # analyses running at once
+    app.config['ANALYSIS_MAX_PENDING'] = int(os.getenv('ANALYSIS_MAX_PENDING', '8'))  # running + queued; beyond this requests get 429
+    app.config['PREVIEW_MIN_RECORDS'] = 5000  # show a sampled preview first for uploads at least this large
+    app.config['PREVIEW_SAMPLE_SIZE'] = 200
+    app.config['RETENTION_DISK_BUDGET'] = 5 * 1024 * 1024 * 1024  # uploads + reports kept on disk
+    app.config['RETENTION_TTL'] = 7 * 24 * 3600  # seconds since last access
+    app.config['RETENTION_SWEEP_INTERVAL'] = 300
+    app.config['RETENTION_COMPACT_AFTER'] = 3600  # reports unread this long are rewritten without indentation
+    app.config['RETENTION_ADOPT_INTERVAL'] = 15  # how often reports written outside the app (watch daemon) are picked up
     
     # Ensure upload and reports directories exist
     # os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -14,6 +30,39 @@ def create_app():
     os.makedirs(os.path.join(os.getcwd(), app.config['UPLOAD_FOLDER']), exist_ok=True)
     os.makedirs(os.path.join(os.getcwd(), app.config['REPORTS_FOLDER']), exist_ok=True)
     
+    from app.chunked_upload import ChunkedUploadStore
+    app.extensions['chunked_uploads'] = ChunkedUploadStore(
+        os.path.join(os.getcwd(), app.config['UPLOAD_FOLDER']),
+        app.config['UPLOAD_CHUNK_SIZE']
+    )
+    
+    from app.retention import RetentionManager
+    upload_folder = os.path.join(os.getcwd(), app.config['UPLOAD_FOLDER'])
+    reports_folder = os.path.join(os.getcwd(), app.config['REPORTS_FOLDER'])
+    retention = RetentionManager(
+        os.path.join(reports_folder, '.retention_index.json'),
+        disk_budget=app.config['RETENTION_DISK_BUDGET'],
+        ttl=app.config['RETENTION_TTL'],
+        sweep_interval=app.config['RETENTION_SWEEP_INTERVAL'],
+        compact_after=app.config['RETENTION_COMPACT_AFTER'],
+        # Reports written by the watch daemon are registered in the background, not per request
+        adopt_folders={'report': reports_folder},
+        adopt_interval=app.config['RETENTION_ADOPT_INTERVAL']
+    )
+    retention.bootstrap({'upload': upload_folder, 'report': reports_folder})
+    retention.start()
+    app.extensions['retention'] = retention
+    
+    from app.executor import AnalysisExecutor
+    app.extensions['analysis_executor'] = AnalysisExecutor(
+        max_workers=app.config['ANALYSIS_WORKERS'],
+        max_pending=app.config['ANALYSIS_MAX_PENDING'],
+        mode=app.config['ANALYSIS_EXECUTOR']
+    )
+    
+    from app.progress import ProgressBroker
+    app.extensions['progress'] = ProgressBroker()
+    
     from app.routes import main
     app.register_blueprint(main)
     
@@ -0,0 +1,217 @@
+import os
+import re
+import json
+import uuid
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from werkzeug.utils import secure_filename
+
+from core.streaming import IncrementalJSONLReader
+
+UPLOAD_ROLES = ('original', 'exported')
+# N-way comparisons upload one "exported_<annotator>" role per export; the name becomes a report id suffix
+ANNOTATOR_ROLE_PREFIX = 'exported_'
+ANNOTATOR_ROLE_PATTERN = re.compile(r'exported_([A-Za-z0-9_.-]{1,64})')
+
+
+def is_upload_role(role: str) -> bool:
+    return role in UPLOAD_ROLES or bool(isinstance(role, str) and ANNOTATOR_ROLE_PATTERN.fullmatch(role))
+
+
+class UploadError(Exception):
+    """청크 업로드 처리 중 발생한 오류 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, message: str, status: int = 400, state: Dict[str, Any] = None):
+        super().__init__(message)
+        self.status = status
+        self.state = state
+
+
+class ChunkedUpload:
+    """세션 디렉토리에 청크를 이어 쓰는 단일 파일 업로드
+
+    진행 상태는 `<role>.upload.json` 매니페스트에 저장되어
+    서버가 재시작되어도 마지막 청크부터 이어서 받을 수 있습니다.
+    """
+
+    def __init__(self, session_dir: str, role: str, filename: str, total_size: int, chunk_size: int):
+        self.session_dir = session_dir
+        self.role = role
+        self.filename = filename
+        self.path = os.path.join(session_dir, f"{role}_{filename}")
+        self.total_size = total_size
+        self.chunk_size = chunk_size
+        self.received_bytes = 0
+        self.next_index = 0
+        self.complete = False
+        # Lines are validated while uploading; the analysis job reads the file from disk
+        self.reader = IncrementalJSONLReader()
+        self.lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.session_dir, f"{self.role}.upload.json")
+
+    @property
+    def total_chunks(self) -> int:
+        return -(-self.total_size // self.chunk_size)
+
+    def state(self) -> Dict[str, Any]:
+        state = {
+            "role": self.role,
+            "filename": self.filename,
+            "total_size": self.total_size,
+            "chunk_size": self.chunk_size,
+            "total_chunks": self.total_chunks,
+            "received_bytes": self.received_bytes,
+            "next_index": self.next_index,
+            "complete": self.complete,
+            "line_count": self.reader.line_count,
+            "parse_errors": len(self.reader.errors)
+        }
+        if self.complete:
+            state["sha256"] = self.reader.hexdigest
+        return state
+
+    def save_manifest(self) -> None:
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state(), f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def write_chunk(self, index: int, data: bytes) -> int:
+        """index 번째 청크를 기록하고 해싱/파싱을 진행합니다. 새로 기록한 바이트 수를 반환합니다."""
+        if self.complete or index < self.next_index:
+            # Chunk was already stored (client retry after a lost response)
+            return 0
+        if index > self.next_index:
+            raise UploadError(f"{self.next_index}번 청크부터 전송해야 합니다.", 409, self.state())
+
+        expected = min(self.chunk_size, self.total_size - self.received_bytes)
+        if len(data) != expected:
+            raise UploadError(f"청크 크기가 올바르지 않습니다. (기대값: {expected}, 수신: {len(data)})", 400, self.state())
+
+        with open(self.path, 'r+b' if os.path.exists(self.path) else 'wb') as f:
+            f.seek(self.received_bytes)
+            f.write(data)
+            f.truncate()
+
+        self.reader.feed(data)
+        self.received_bytes += len(data)
+        self.next_index += 1
+        if self.received_bytes == self.total_size:
+            self._finish()
+        self.save_manifest()
+        return len(data)
+
+    def _finish(self) -> None:
+        self.reader.finish()
+        self.complete = True
+
+    @classmethod
+    def restore(cls, session_dir: str, role: str) -> Optional['ChunkedUpload']:
+        """매니페스트와 부분 파일로부터 업로드 상태를 복원합니다."""
+        manifest_path = os.path.join(session_dir, f"{role}.upload.json")
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        upload = cls(session_dir, role, manifest['filename'], manifest['total_size'], manifest['chunk_size'])
+        if os.path.exists(upload.path):
+            # Drop bytes written after the last persisted manifest
+            with open(upload.path, 'r+b') as f:
+                f.truncate(min(manifest['received_bytes'], os.path.getsize(upload.path)))
+                f.seek(0)
+                for chunk in iter(lambda: f.read(upload.chunk_size), b''):
+                    upload.reader.feed(chunk)
+
+        upload.received_bytes = upload.reader.bytes_received
+        upload.next_index = upload.received_bytes // upload.chunk_size
+        if upload.received_bytes == upload.total_size:
+            upload._finish()
+        return upload
+
+
+class ChunkedUploadStore:
+    """세션별 청크 업로드를 관리하는 저장소"""
+
+    def __init__(self, upload_folder: str, chunk_size: int):
+        self.upload_folder = upload_folder
+        self.chunk_size = chunk_size
+        self._uploads: Dict[tuple, ChunkedUpload] = {}
+        self._lock = threading.Lock()
+
+    def _session_dir(self, session_id: str) -> str:
+        try:
+            session_id = str(uuid.UUID(session_id))
+        except (ValueError, TypeError, AttributeError):
+            raise UploadError("잘못된 세션 ID입니다.", 404)
+        return os.path.join(self.upload_folder, session_id)
+
+    def init_upload(self, session_id: Optional[str], role: str, filename: str, total_size: int) -> Dict[str, Any]:
+        """업로드를 시작하거나, 같은 파일의 기존 업로드가 있으면 이어받을 상태를 반환합니다."""
+        if not is_upload_role(role):
+            raise UploadError("role은 original, exported 또는 exported_<어노테이터 이름> 이어야 합니다.")
+        if total_size < 0:
+            raise UploadError("파일 크기가 올바르지 않습니다.")
+
+        filename = secure_filename(filename)
+        if session_id:
+            session_dir = self._session_dir(session_id)
+            existing = self.get(session_id, role, required=False)
+            if existing and existing.filename == filename and existing.total_size == total_size:
+                return {"session_id": session_id, **existing.state()}
+        else:
+            session_id = str(uuid.uuid4())
+            session_dir = self._session_dir(session_id)
+
+        os.makedirs(session_dir, exist_ok=True)
+        upload = ChunkedUpload(session_dir, role, filename, total_size, self.chunk_size)
+        if total_size == 0:
+            open(upload.path, 'wb').close()
+            upload._finish()
+        upload.save_manifest()
+
+        with self._lock:
+            self._uploads[(session_id, role)] = upload
+        return {"session_id": session_id, **upload.state()}
+
+    def get(self, session_id: str, role: str, required: bool = True) -> Optional[ChunkedUpload]:
+        """진행 중인 업로드를 찾습니다. 메모리에 없으면 디스크에서 복원합니다."""
+        session_dir = self._session_dir(session_id)
+        with self._lock:
+            upload = self._uploads.get((session_id, role))
+            if upload is None and is_upload_role(role):
+                upload = ChunkedUpload.restore(session_dir, role)
+                if upload is not None:
+                    self._uploads[(session_id, role)] = upload
+
+        if upload is None and required:
+            raise UploadError("업로드를 찾을 수 없습니다.", 404)
+        return upload
+
+    def write_chunk(self, session_id: str, role: str, index: int, data: bytes) -> Tuple[ChunkedUpload, int]:
+        upload = self.get(session_id, role)
+        with upload.lock:
+            written = upload.write_chunk(index, data)
+        return upload, written
+
+    def roles(self, session_id: str) -> List[str]:
+        """세션에서 시작된 업로드의 role 목록입니다. (디스크의 매니페스트 기준)"""
+        session_dir = self._session_dir(session_id)
+        if not os.path.isdir(session_dir):
+            raise UploadError("업로드를 찾을 수 없습니다.", 404)
+        suffix = '.upload.json'
+        return sorted(
+            name[:-len(suffix)] for name in os.listdir(session_dir)
+            if name.endswith(suffix) and is_upload_role(name[:-len(suffix)])
+        )
+
+    def discard(self, session_id: str) -> None:
+        """분석을 시작한 세션의 메모리 상태를 해제합니다."""
+        with self._lock:
+            for key in [key for key in self._uploads if key[0] == session_id]:
+                del self._uploads[key]
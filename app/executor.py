@@ -0,0 +1,164 @@
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict
+
+EXECUTOR_MODES = ('thread', 'process')
+
+# Set in each worker process by _init_worker
+_event_queue = None
+
+
+class QueueFull(Exception):
+    """실행 중/대기 중인 분석이 한도에 도달해 새 작업을 받을 수 없을 때 발생합니다."""
+
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _init_worker(event_queue) -> None:
+    global _event_queue
+    _event_queue = event_queue
+
+
+def _run_in_worker(session_id: str, fn: Callable, args: tuple) -> Any:
+    def publish(event_type, data):
+        _event_queue.put((session_id, event_type, data))
+    return fn(publish, *args)
+
+
+class AnalysisExecutor:
+    """요청 처리 스레드와 분리된 크기 제한 분석 실행기
+
+    작업 함수는 fn(publish, *args) 형태이며, publish(event_type, data)로 진행 상황을 알립니다.
+    mode='process'에서는 spawn으로 띄운 워커 프로세스에서 실행되므로 분석이 웹 프로세스의
+    GIL을 잡지 않습니다. 이때 fn과 인자, 반환값은 pickle 가능해야 합니다.
+    실행 중인 작업과 대기 중인 작업의 합이 max_pending에 이르면 submit()이 QueueFull을 발생시킵니다.
+    워커 프로세스가 비정상 종료되면(메모리 부족으로 강제 종료 등) 그 풀의 작업은 BrokenProcessPool로 실패하고,
+    풀과 이벤트 큐를 새로 만들어 이후 작업을 계속 받습니다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, mode: str = 'thread'):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"알 수 없는 실행기 모드: {mode}")
+        self.max_workers = max_workers
+        # Counts running jobs too, so it must leave room for every worker
+        self.max_pending = max(max_pending, max_workers)
+        self.mode = mode
+        self._handlers: Dict[str, Callable[[str, Dict[str, Any]], None]] = {}
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._submitted = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._start_pool()
+
+    def _start_pool(self) -> None:
+        if self.mode == 'process':
+            # spawn: forking a threaded web worker could copy held locks into the child
+            context = multiprocessing.get_context('spawn')
+            # A fresh queue per pool: a killed worker may have died holding the old queue's write lock
+            self._events = context.Queue()
+            self._pool = ProcessPoolExecutor(
+                self.max_workers, mp_context=context, initializer=_init_worker, initargs=(self._events,)
+            )
+            threading.Thread(
+                target=self._forward_events, args=(self._events,), name="analysis-events", daemon=True
+            ).start()
+        else:
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="analysis")
+
+    def submit(self, session_id: str, fn: Callable, *args,
+               on_event: Callable[[str, Dict[str, Any]], None]) -> Future:
+        """작업을 대기열에 넣습니다. 대기열이 가득 찼으면 QueueFull, 같은 세션이 실행 중이면 ValueError."""
+        with self._lock:
+            if session_id in self._handlers:
+                raise ValueError("이미 분석 중인 세션입니다.")
+            if len(self._handlers) >= self.max_pending:
+                self._rejected += 1
+                raise QueueFull(f"분석 대기열이 가득 찼습니다. ({self.max_pending}건) 잠시 후 다시 시도해주세요.")
+            self._handlers[session_id] = on_event
+            self._submitted += 1
+
+        # Published before the job can start, so 'queued' never overwrites a later event
+        on_event('progress', {'stage': 'queued', 'processed': 0, 'total': 0})
+        try:
+            pool = self._pool
+            try:
+                future = self._submit_to(pool, session_id, fn, args)
+            except BrokenProcessPool:
+                # A worker died since the last job finished; retry once on a fresh pool
+                self._restart_pool(pool)
+                pool = self._pool
+                try:
+                    future = self._submit_to(pool, session_id, fn, args)
+                except BrokenProcessPool:
+                    self._restart_pool(pool)
+                    raise QueueFull("분석 실행기를 다시 시작하는 중입니다. 잠시 후 다시 시도해주세요.", retry_after=5)
+        except Exception:
+            self._finished(session_id)
+            raise
+        # Registered first so that no progress event is delivered after the caller's completion callback
+        future.add_done_callback(lambda done: self._job_done(session_id, pool, done))
+        return future
+
+    def _submit_to(self, pool, session_id: str, fn: Callable, args: tuple) -> Future:
+        if self.mode == 'process':
+            return pool.submit(_run_in_worker, session_id, fn, args)
+        return pool.submit(fn, lambda event_type, data: self._dispatch(session_id, event_type, data), *args)
+
+    def _job_done(self, session_id: str, pool, future: Future) -> None:
+        self._finished(session_id)
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._restart_pool(pool)
+
+    def _restart_pool(self, broken) -> None:
+        """깨진 풀을 새 풀로 교체합니다. 이미 교체되었으면 아무것도 하지 않습니다."""
+        with self._pool_lock:
+            if self._pool is not broken:
+                return
+            self._restarts += 1
+            self._start_pool()
+        broken.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": len(self._handlers),
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "restarts": self._restarts
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _dispatch(self, session_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        # Holding the lock orders events before _finished; events of finished jobs are dropped
+        with self._lock:
+            handler = self._handlers.get(session_id)
+            if handler is not None:
+                handler(event_type, data)
+
+    def _finished(self, session_id: str) -> None:
+        with self._lock:
+            self._handlers.pop(session_id, None)
+
+    def _forward_events(self, events) -> None:
+        """워커 프로세스가 보낸 이벤트를 웹 프로세스의 핸들러로 전달합니다. 풀이 교체되면 끝납니다."""
+        while events is self._events:
+            try:
+                session_id, event_type, data = events.get(timeout=1.0)
+                self._dispatch(session_id, event_type, data)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            except Exception as e:
+                print(f"analysis event forwarding failed: {e}")
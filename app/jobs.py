@@ -0,0 +1,127 @@
+"""분석 작업 함수
+
+AnalysisExecutor가 워커 프로세스(또는 스레드)에서 실행하는 함수들입니다.
+Flask 앱 객체 없이 파일 경로와 옵션 dict만 받아, 보고서를 저장하고
+{"report_paths": [...], "summary": ...}를 반환합니다. 모두 pickle 가능한 값입니다.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from core.analyzer import JSONAnalyzer
+from core.multi_analyzer import MultiAnnotatorAnalyzer
+from core.token_cache import TokenCache
+
+Publish = Callable[[str, Dict[str, Any]], None]
+
+# One cache per process, so consecutive jobs in a worker reuse tokenizations
+_token_cache: Optional[TokenCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def analysis_options(config) -> Dict[str, Any]:
+    """앱 설정에서 작업 함수에 넘길 분석 옵션을 뽑습니다."""
+    return {
+        'reports_folder': os.path.abspath(config['REPORTS_FOLDER']),
+        'text_diff_budget': config['TEXT_DIFF_BUDGET'],
+        'text_diff_mode': config['TEXT_DIFF_MODE'],
+        'token_cache_max_tokens': config['TOKEN_CACHE_MAX_TOKENS'],
+        'multi_workers': config['MULTI_ANALYSIS_WORKERS']
+    }
+
+
+def shared_token_cache(max_tokens: int) -> TokenCache:
+    global _token_cache
+    with _token_cache_lock:
+        if _token_cache is None:
+            _token_cache = TokenCache(max_tokens)
+        return _token_cache
+
+
+def summarize_report(report, session_id, report_filename):
+    if report.get('report_type') == 'consensus':
+        return {
+            'success': True,
+            'session_id': session_id,
+            'report_filename': report_filename,
+            'report_type': 'consensus',
+            'annotators': report['metadata']['annotators'],
+            'summary': {
+                'total_records': report['metadata']['total_records'],
+                'shared_records': report['metadata']['shared_records'],
+                'unanimous_records': report['summary']['unanimous_records'],
+                'disputed_items': report['summary']['disputed_items']
+            }
+        }
+
+    return {
+        'success': True,
+        'session_id': session_id,
+        'report_filename': report_filename,
+        'summary': {
+            'total_records': report['metadata']['total_records'],
+            'records_with_changes': report['metadata']['records_with_changes'],
+            'text_changes': report['summary']['text_changes'],
+            'description_changes': report['summary']['description_changes'],
+            'subject_count_changes': report['summary']['subject_count_changes'],
+            'pii_annotation_changes': report['summary']['pii_annotation_changes'],
+            'data_ids_removed': report['summary'].get('data_ids_removed', 0),
+            'data_ids_added': report['summary'].get('data_ids_added', 0)
+        },
+        'preview': report.get('preview')
+    }
+
+
+def analyze_pair(publish: Publish, session_id: str, original_path: str, exported_path: str,
+                 options: Dict[str, Any], preview_sample_size: Optional[int] = None) -> Dict[str, Any]:
+    """원본과 내보낸 파일 한 쌍을 분석합니다.
+
+    preview_sample_size가 주어지면 표본 기반 미리보기 보고서를 먼저 저장하고 'preview' 이벤트로 알린 뒤,
+    정확한 분석이 끝나면 같은 보고서 파일을 교체합니다.
+    """
+    analyzer = JSONAnalyzer(
+        progress_callback=lambda event: publish('progress', event),
+        text_diff_budget=options['text_diff_budget'],
+        text_diff_mode=options['text_diff_mode'],
+        token_cache=shared_token_cache(options['token_cache_max_tokens'])
+    )
+    report_filename = f"report_{session_id}.json"
+    report_path = os.path.join(options['reports_folder'], report_filename)
+
+    if preview_sample_size:
+        preview_report = analyzer.preview_files(original_path, exported_path, sample_size=preview_sample_size)
+        analyzer.save_report(preview_report, report_path)
+        publish('preview', {
+            'report_paths': [report_path],
+            'summary': summarize_report(preview_report, session_id, report_filename)
+        })
+
+    report = analyzer.analyze_files(original_path, exported_path)
+    analyzer.save_report(report, report_path)
+    return {'report_paths': [report_path], 'summary': summarize_report(report, session_id, report_filename)}
+
+
+def analyze_multi(publish: Publish, session_id: str, original_path: str, exported_paths: Dict[str, str],
+                  options: Dict[str, Any]) -> Dict[str, Any]:
+    """원본 하나와 어노테이터별 내보낸 파일을 비교하여 어노테이터별 보고서와 통합 보고서를 저장합니다."""
+    analyzer = MultiAnnotatorAnalyzer(
+        max_workers=options['multi_workers'],
+        progress_callback=lambda event: publish('progress', event),
+        text_diff_budget=options['text_diff_budget'],
+        text_diff_mode=options['text_diff_mode'],
+        token_cache=shared_token_cache(options['token_cache_max_tokens'])
+    )
+    result = analyzer.analyze_files(original_path, exported_paths)
+
+    writer = JSONAnalyzer()
+    report_paths = []
+    for annotator, report in result['reports'].items():
+        report_path = os.path.join(options['reports_folder'], f"report_{session_id}_{annotator}.json")
+        writer.save_report(report, report_path)
+        report_paths.append(report_path)
+
+    report_filename = f"report_{session_id}.json"
+    report_path = os.path.join(options['reports_folder'], report_filename)
+    writer.save_report(result['consensus'], report_path)
+    report_paths.append(report_path)
+    return {'report_paths': report_paths, 'summary': summarize_report(result['consensus'], session_id, report_filename)}
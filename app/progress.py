@@ -0,0 +1,84 @@
+import json
+import time
+import threading
+from typing import Dict, Any, Iterator, Optional
+
+
+class ProgressBroker:
+    """세션별 분석 진행 이벤트를 보관하고 구독자에게 전달하는 클래스
+
+    세션마다 마지막 진행 이벤트와 종료 이벤트만 보관하므로,
+    늦게 연결한 구독자도 현재 상태를 바로 받을 수 있습니다.
+    'preview' 이벤트는 뒤이은 진행 이벤트에 덮이지 않도록 따로 보관하여, 아직 받지 못한 구독자에게 먼저 보냅니다.
+    """
+
+    def __init__(self, retention_seconds: float = 600.0):
+        self.retention_seconds = retention_seconds
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+
+    def publish(self, session_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """이벤트를 기록하고 대기 중인 구독자를 깨웁니다.
+
+        event_type은 'progress', 'preview', 'done', 'error' 중 하나입니다.
+        """
+        with self._condition:
+            self._expire()
+            session = self._sessions.setdefault(
+                session_id, {"seq": 0, "event": None, "preview": None, "finished_at": None}
+            )
+            session["seq"] += 1
+            session["event"] = (event_type, data)
+            if event_type == 'preview':
+                session["preview"] = (session["seq"], data)
+            if event_type in ('done', 'error'):
+                session["finished_at"] = time.monotonic()
+            self._condition.notify_all()
+
+    def latest(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            session = self._sessions.get(session_id)
+            if session is None or session["event"] is None:
+                return None
+            event_type, data = session["event"]
+            return {"event": event_type, "data": data}
+
+    def stream(self, session_id: str, heartbeat: float = 15.0) -> Iterator[str]:
+        """Server-Sent Events 형식의 문자열을 생성합니다. 종료 이벤트를 보내면 끝납니다."""
+        last_seq = 0
+        preview_seq = 0
+        while True:
+            events = []
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._sessions.get(session_id, {}).get("seq", 0) != last_seq,
+                    timeout=heartbeat
+                )
+                session = self._sessions.get(session_id)
+                if session is not None and session["seq"] != last_seq:
+                    # A preview overwritten by later events is sent before them
+                    if session["preview"] is not None and session["preview"][0] > preview_seq:
+                        preview_seq, preview = session["preview"]
+                        if preview_seq != session["seq"]:
+                            events.append((preview_seq, ('preview', preview)))
+                    last_seq = session["seq"]
+                    events.append((last_seq, session["event"]))
+
+            if not events:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+
+            for seq, (event_type, data) in events:
+                yield f"id: {seq}\nevent: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if event_type in ('done', 'error'):
+                    return
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if session["finished_at"] is not None and now - session["finished_at"] > self.retention_seconds
+        ]
+        for session_id in expired:
+            del self._sessions[session_id]
@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Dict, Any, List, Optional
+
+
+class RetentionManager:
+    """업로드/보고서의 디스크 사용량을 예산과 TTL 안으로 유지하는 클래스
+
+    파일 크기와 마지막 접근 시간은 작은 인덱스 파일에 기록하므로,
+    정리할 때 업로드/보고서 디렉토리를 다시 훑지 않습니다.
+    백그라운드 스레드가 주기적으로 만료 항목과 오래 접근하지 않은 항목(LRU)을 삭제하고,
+    한동안 열람되지 않은 보고서는 들여쓰기 없는 JSON으로 압축합니다.
+    분석 대기/실행 중인 업로드는 pin()으로 고정하여 정리 대상에서 제외합니다.
+    앱 밖에서 만들어진 파일(감시 데몬의 보고서 등)은 같은 스레드가 adopt_folders를 확인하여 등록합니다.
+    """
+
+    def __init__(self, index_path: str, disk_budget: int, ttl: float,
+                 sweep_interval: float = 300.0, compact_after: float = 3600.0, min_idle: float = 60.0,
+                 adopt_folders: Optional[Dict[str, str]] = None, adopt_interval: float = 15.0):
+        self.index_path = index_path
+        self.disk_budget = disk_budget
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.compact_after = compact_after
+        # Entries touched more recently than this are never evicted (uploads in progress)
+        self.min_idle = min_idle
+        # {종류: 디렉토리} scanned for untracked files, only when the directory's mtime changes
+        self.adopt_folders = adopt_folders or {}
+        self.adopt_interval = adopt_interval
+        self._folder_mtimes: Dict[str, int] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # path -> pin count; in memory only, since queued jobs do not survive a restart
+        self._pinned: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = json.dumps(self._entries)
+            self._dirty = False
+
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(entries)
+        os.replace(tmp_path, self.index_path)
+
+    def bootstrap(self, folders: Dict[str, str]) -> None:
+        """인덱스가 비어 있을 때 한 번만 기존 파일을 등록합니다. ({종류: 디렉토리})"""
+        if self._entries:
+            return
+        for kind, folder in folders.items():
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if path == self.index_path or name.endswith('.tmp'):
+                    continue
+                self.record(path, kind, self._disk_usage(path), os.path.getmtime(path))
+        self._save()
+
+    def record(self, path: str, kind: str, size: Optional[int] = None, modified: Optional[float] = None) -> None:
+        """파일/디렉토리를 등록하거나 크기를 갱신합니다. size가 없으면 파일 크기를 읽습니다.
+
+        modified는 내용이 마지막으로 바뀐 시각입니다. 없으면 지금 쓰인 것으로 봅니다.
+        """
+        path = os.path.abspath(path)
+        if size is None:
+            size = os.path.getsize(path)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.setdefault(path, {"kind": kind, "created": now, "compacted": False})
+            entry["size"] = size
+            entry["modified"] = modified if modified is not None else now
+            entry["last_access"] = now
+            if kind == 'report':
+                entry["compacted"] = False
+            self._dirty = True
+
+    def adopt(self, path: str, kind: str, size: Optional[int] = None, modified: Optional[float] = None) -> bool:
+        """앱 밖에서 만들어진 파일(감시 데몬의 보고서 등)을 아직 등록되지 않았을 때만 등록합니다."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self._entries:
+                return False
+        self.record(path, kind, size, modified)
+        return True
+
+    def adopt_untracked(self) -> List[str]:
+        """adopt_folders에서 인덱스에 없는 파일을 등록하고, 밖에서 다시 쓰인 파일의 크기를 갱신합니다.
+
+        디렉토리 mtime이 그대로면 훑지 않습니다.
+        """
+        adopted = []
+        for kind, folder in self.adopt_folders.items():
+            try:
+                mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                continue
+            if self._folder_mtimes.get(folder) == mtime:
+                continue
+            self._folder_mtimes[folder] = mtime
+
+            for entry in os.scandir(folder):
+                if not entry.is_file() or entry.name.endswith('.tmp') or entry.path == self.index_path:
+                    continue
+                stat = entry.stat()
+                path = os.path.abspath(entry.path)
+                if self.adopt(path, kind, stat.st_size, stat.st_mtime):
+                    adopted.append(path)
+                    continue
+                with self._lock:
+                    # Rewritten outside the app (watch daemon re-analysis); not counted as an access
+                    tracked = self._entries.get(path)
+                    if tracked is not None and tracked.get("modified") != stat.st_mtime:
+                        tracked["size"] = stat.st_size
+                        tracked["modified"] = stat.st_mtime
+                        self._dirty = True
+        return adopted
+
+    def entries(self, kind: str) -> List[tuple]:
+        """인덱스에 등록된 kind 항목의 (경로, 항목 사본) 목록입니다. 디렉토리를 훑지 않습니다."""
+        with self._lock:
+            return [(path, dict(entry)) for path, entry in self._entries.items() if entry["kind"] == kind]
+
+    def grow(self, path: str, kind: str, nbytes: int) -> None:
+        """업로드 중인 디렉토리처럼 점점 커지는 항목의 크기를 늘립니다."""
+        path = os.path.abspath(path)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.setdefault(path, {"kind": kind, "created": now, "compacted": False, "size": 0})
+            entry["size"] += nbytes
+            entry["last_access"] = now
+            self._dirty = True
+
+    def touch(self, path: str) -> None:
+        """열람 시 마지막 접근 시간을 갱신합니다. 인덱스는 다음 정리 때 저장됩니다."""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                entry["last_access"] = time.time()
+                self._dirty = True
+
+    def pin(self, path: str) -> None:
+        """사용 중인 항목(분석 대기/실행 중인 업로드)을 unpin()할 때까지 삭제하지 않습니다."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._pinned[path] = self._pinned.get(path, 0) + 1
+
+    def unpin(self, path: str) -> None:
+        path = os.path.abspath(path)
+        with self._lock:
+            count = self._pinned.pop(path, 0) - 1
+            if count > 0:
+                self._pinned[path] = count
+            entry = self._entries.get(path)
+            if entry is not None:
+                # Idle time starts counting again from the end of the job
+                entry["last_access"] = time.time()
+                self._dirty = True
+
+    def release(self, path: str) -> None:
+        """더 이상 필요 없는 항목(분석이 끝난 업로드 등)을 즉시 삭제합니다."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if self._entries.pop(path, None) is not None:
+                self._dirty = True
+        self._delete(path)
+
+    def total_size(self) -> int:
+        with self._lock:
+            return sum(entry["size"] for entry in self._entries.values())
+
+    def sweep(self) -> Dict[str, List[str]]:
+        """만료/예산 초과 항목을 삭제하고 오래된 보고서를 압축합니다."""
+        now = time.time()
+        with self._lock:
+            entries = sorted(self._entries.items(), key=lambda item: item[1]["last_access"])
+            total = sum(entry["size"] for _, entry in entries)
+
+            evicted = []
+            for path, entry in entries:
+                idle = now - entry["last_access"]
+                if idle < self.min_idle or path in self._pinned:
+                    continue
+                if idle > self.ttl or total > self.disk_budget:
+                    evicted.append(path)
+                    total -= entry["size"]
+                    del self._entries[path]
+
+            to_compact = [
+                path for path, entry in self._entries.items()
+                if entry["kind"] == 'report' and not entry["compacted"]
+                and now - entry["last_access"] > self.compact_after
+            ]
+            if evicted:
+                self._dirty = True
+
+        for path in evicted:
+            self._delete(path)
+        compacted = [path for path in to_compact if self._compact_report(path)]
+        self._save()
+        return {"evicted": evicted, "compacted": compacted}
+
+    def _compact_report(self, path: str) -> bool:
+        """보고서를 들여쓰기 없는 JSON으로 다시 저장합니다."""
+        try:
+            stat = os.stat(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, separators=(',', ':'))
+            # Same content, so keep the modification time shown in the report list
+            os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            return False
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                entry["size"] = os.path.getsize(path)
+                entry["compacted"] = True
+                self._dirty = True
+        return True
+
+    def _delete(self, path: str) -> None:
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def _disk_usage(self, path: str) -> int:
+        if os.path.isfile(path):
+            return os.path.getsize(path)
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
+
+    def start(self) -> None:
+        """주기적으로 adopt_untracked()와 sweep()을 실행하는 백그라운드 스레드를 시작합니다."""
+        if self._thread is not None:
+            return
+
+        def run():
+            next_sweep = time.monotonic() + self.sweep_interval
+            while True:
+                try:
+                    self.adopt_untracked()
+                    if time.monotonic() >= next_sweep:
+                        next_sweep = time.monotonic() + self.sweep_interval
+                        self.sweep()
+                except Exception as e:
+                    print(f"retention sweep failed: {e}")
+                if self._stop.wait(min(self.adopt_interval, self.sweep_interval)):
+                    return
+
+        self._thread = threading.Thread(target=run, name="retention-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -1,12 +1,15 @@
-from flask import Blueprint, render_template, request, jsonify, send_file, flash, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, jsonify, send_file, flash, redirect, url_for, current_app, Response, stream_with_context
 import os
 import uuid
 from datetime import datetime
+from concurrent.futures.process import BrokenProcessPool
 from werkzeug.utils import secure_filename
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import JSONAnalyzer
+from app.chunked_upload import ANNOTATOR_ROLE_PREFIX, UploadError
+from app.executor import QueueFull
+from app.jobs import analysis_options, analyze_multi, analyze_pair, summarize_report
 
 main = Blueprint('main', __name__)
 
@@ -48,34 +51,325 @@ def upload_files():
         
         original_file.save(original_path)
         exported_file.save(exported_path)
+        current_app.extensions['retention'].record(
+            session_dir, 'upload', os.path.getsize(original_path) + os.path.getsize(exported_path)
+        )
         
-        # Analyze files
-        analyzer = JSONAnalyzer()
-        report = analyzer.analyze_files(original_path, exported_path)
+        # Analyze in the shared worker pool; this request waits for the result
+        future = start_analysis_job(
+            current_app._get_current_object(), session_id, analyze_pair,
+            os.path.abspath(original_path), os.path.abspath(exported_path), analysis_options(current_app.config)
+        )
+        return jsonify(future.result()['summary'])
         
-        # Save report
+    except QueueFull as e:
+        current_app.extensions['retention'].release(session_dir)
+        return queue_full_response(e)
+    except Exception as e:
+        return jsonify({'error': f'분석 중 오류가 발생했습니다: {str(e)}'}), 500
+
+def upload_error_response(error):
+    body = {'error': str(error)}
+    if error.state is not None:
+        body['state'] = error.state
+    return jsonify(body), error.status
+
+def queue_full_response(error):
+    body = {'error': str(error), 'analysis': current_app.extensions['analysis_executor'].stats()}
+    return jsonify(body), 429, {'Retry-After': str(error.retry_after)}
+
+@main.route('/api/upload/init', methods=['POST'])
+def chunked_upload_init():
+    """청크 업로드를 시작하거나 중단된 업로드의 재개 위치를 알려줍니다."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    filename = data.get('filename', '')
+    
+    if not isinstance(filename, str) or not allowed_file(filename):
+        return jsonify({'error': 'JSON 또는 JSONL 파일만 업로드 가능합니다.'}), 400
+    
+    try:
+        store = current_app.extensions['chunked_uploads']
+        state = store.init_upload(
+            data.get('session_id'),
+            data.get('role'),
+            filename,
+            int(data.get('size', -1))
+        )
+        current_app.extensions['retention'].grow(os.path.join(store.upload_folder, state['session_id']), 'upload', 0)
+    except UploadError as e:
+        return upload_error_response(e)
+    except (TypeError, ValueError):
+        # int() raises TypeError for JSON null, lists and objects
+        return jsonify({'error': '파일 크기가 올바르지 않습니다.'}), 400
+    
+    return jsonify(state)
+
+@main.route('/api/upload/<session_id>/<role>', methods=['GET'])
+def chunked_upload_status(session_id, role):
+    try:
+        upload = current_app.extensions['chunked_uploads'].get(session_id, role)
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    return jsonify({'session_id': session_id, **upload.state()})
+
+@main.route('/api/upload/<session_id>/<role>/chunk/<int:index>', methods=['PUT'])
+def chunked_upload_chunk(session_id, role, index):
+    """청크를 세션 디렉토리에 바로 기록합니다. 해싱과 라인 검증은 수신과 동시에 진행됩니다."""
+    store = current_app.extensions['chunked_uploads']
+    try:
+        upload, written = store.write_chunk(session_id, role, index, request.get_data(cache=False))
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    current_app.extensions['retention'].grow(upload.session_dir, 'upload', written)
+    
+    return jsonify({'session_id': session_id, **upload.state()})
+
+@main.route('/api/upload/<session_id>/complete', methods=['POST'])
+def chunked_upload_complete(session_id):
+    """두 파일의 업로드가 끝나면 분석 작업을 실행기에 넣습니다. 대기열이 가득 차면 429를 반환합니다."""
+    store = current_app.extensions['chunked_uploads']
+    try:
+        original = store.get(session_id, 'original')
+        exported = store.get(session_id, 'exported')
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    not_ready = uploads_not_ready_response([original, exported])
+    if not_ready is not None:
+        return not_ready
+    
+    preview_sample_size = None
+    if original.reader.line_count >= current_app.config['PREVIEW_MIN_RECORDS']:
+        preview_sample_size = current_app.config['PREVIEW_SAMPLE_SIZE']
+    
+    try:
+        start_analysis_job(
+            current_app._get_current_object(), session_id, analyze_pair,
+            os.path.abspath(original.path), os.path.abspath(exported.path),
+            analysis_options(current_app.config), preview_sample_size
+        )
+    except QueueFull as e:
+        # Uploads are kept, so the client can simply call complete again later
+        return queue_full_response(e)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 409
+    
+    # The job reads the uploaded files from disk; the in-memory upload state is no longer needed
+    store.discard(session_id)
+    return jsonify({
+        'success': True,
+        'session_id': session_id,
+        'status': 'running',
+        'progress_url': url_for('main.analysis_progress', session_id=session_id)
+    }), 202
+
+@main.route('/api/upload/<session_id>/complete/multi', methods=['POST'])
+def chunked_upload_complete_multi(session_id):
+    """원본('original')과 두 개 이상의 'exported_<어노테이터>' 업로드가 끝나면 N-way 분석 작업을 실행기에 넣습니다."""
+    store = current_app.extensions['chunked_uploads']
+    try:
+        roles = store.roles(session_id)
+        annotator_roles = [role for role in roles if role.startswith(ANNOTATOR_ROLE_PREFIX)]
+        if 'original' not in roles or len(annotator_roles) < 2:
+            return jsonify({'error': '원본 파일과 두 개 이상의 내보낸 파일을 업로드해주세요.', 'roles': roles}), 400
+        original = store.get(session_id, 'original')
+        exported = {role[len(ANNOTATOR_ROLE_PREFIX):]: store.get(session_id, role) for role in annotator_roles}
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    not_ready = uploads_not_ready_response([original] + list(exported.values()))
+    if not_ready is not None:
+        return not_ready
+    
+    try:
+        start_analysis_job(
+            current_app._get_current_object(), session_id, analyze_multi,
+            os.path.abspath(original.path),
+            {annotator: os.path.abspath(upload.path) for annotator, upload in exported.items()},
+            analysis_options(current_app.config)
+        )
+    except QueueFull as e:
+        return queue_full_response(e)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 409
+    
+    store.discard(session_id)
+    return jsonify({
+        'success': True,
+        'session_id': session_id,
+        'status': 'running',
+        'annotators': list(exported),
+        'progress_url': url_for('main.analysis_progress', session_id=session_id)
+    }), 202
+
+def uploads_not_ready_response(uploads):
+    """업로드가 덜 끝났거나 파싱 오류가 있으면 오류 응답을, 모두 준비되었으면 None을 반환합니다."""
+    if not all(upload.complete for upload in uploads):
+        return jsonify({
+            'error': '파일 업로드가 아직 완료되지 않았습니다.',
+            'state': {upload.role: upload.state() for upload in uploads}
+        }), 409
+    
+    for upload in uploads:
+        if upload.reader.errors:
+            return jsonify({
+                'error': f'{upload.filename} 파일 파싱 실패 ({upload.reader.errors[0]["line"]}번째 줄): {upload.reader.errors[0]["error"]}',
+                'parse_errors': upload.reader.errors
+            }), 400
+    return None
+
+def start_analysis_job(app, session_id, fn, *args):
+    """app.jobs의 작업 함수를 공유 분석 실행기에 넣고 진행 상황을 ProgressBroker에 게시합니다.
+    
+    fn(publish, session_id, *args)는 보고서를 저장하고 {"report_paths", "summary"}를 반환합니다.
+    'preview' 이벤트로 받은 미리보기 보고서는 바로 보존 인덱스에 등록하고,
+    업로드 디렉토리는 작업이 끝날 때까지 정리 대상에서 제외(pin)합니다.
+    실행기 대기열이 가득 차면 QueueFull이 발생하며, 반환값은 작업의 Future입니다.
+    """
+    broker = app.extensions['progress']
+    retention = app.extensions['retention']
+    upload_dir = os.path.join(os.getcwd(), app.config['UPLOAD_FOLDER'], session_id)
+    
+    def on_event(event_type, data):
+        if event_type == 'preview':
+            for report_path in data['report_paths']:
+                retention.record(report_path, 'report')
+            data = data['summary']
+        broker.publish(session_id, event_type, data)
+    
+    def on_done(future):
+        retention.unpin(upload_dir)
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            # The executor has already replaced the pool; the uploads are kept so the job can be retried
+            broker.publish(session_id, 'error', {
+                'error': '분석 프로세스가 비정상 종료되었습니다. (메모리 부족 등) 잠시 후 다시 시도해주세요.'
+            })
+            return
+        except Exception as e:
+            broker.publish(session_id, 'error', {'error': f'분석 중 오류가 발생했습니다: {str(e)}'})
+            return
+        
+        # The report is persisted, so the uploaded files are no longer needed
+        for report_path in result['report_paths']:
+            retention.record(report_path, 'report')
+        retention.release(upload_dir)
+        broker.publish(session_id, 'done', result['summary'])
+    
+    # Queued jobs can wait longer than the sweeper's min_idle; keep their uploads until they finish
+    retention.pin(upload_dir)
+    try:
+        future = app.extensions['analysis_executor'].submit(session_id, fn, session_id, *args, on_event=on_event)
+    except Exception:
+        retention.unpin(upload_dir)
+        raise
+    future.add_done_callback(on_done)
+    return future
+
+@main.route('/upload/multi', methods=['POST'])
+def upload_multi_files():
+    """원본 하나와 여러 어노테이터의 내보낸 파일을 한 번에 비교합니다."""
+    original_file = request.files.get('original_file')
+    exported_files = [f for f in request.files.getlist('exported_files') if f.filename]
+    
+    if original_file is None or original_file.filename == '' or len(exported_files) < 2:
+        return jsonify({'error': '원본 파일과 두 개 이상의 내보낸 파일을 업로드해주세요.'}), 400
+    
+    if not all(allowed_file(f.filename) for f in [original_file] + exported_files):
+        return jsonify({'error': 'JSON 또는 JSONL 파일만 업로드 가능합니다.'}), 400
+    
+    session_id = str(uuid.uuid4())
+    session_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], session_id)
+    os.makedirs(session_dir, exist_ok=True)
+    
+    original_path = os.path.join(session_dir, f"original_{secure_filename(original_file.filename)}")
+    original_file.save(original_path)
+    
+    # Annotator names come from the file names and double as report id suffixes
+    exported_paths = {}
+    for exported_file in exported_files:
+        filename = secure_filename(exported_file.filename)
+        annotator = os.path.splitext(filename)[0] or 'annotator'
+        name, n = annotator, 2
+        while name in exported_paths:
+            name, n = f"{annotator}-{n}", n + 1
+        exported_paths[name] = os.path.join(session_dir, f"exported_{name}_{filename}")
+        exported_file.save(exported_paths[name])
+    
+    current_app.extensions['retention'].record(
+        session_dir, 'upload', sum(os.path.getsize(path) for path in [original_path] + list(exported_paths.values()))
+    )
+    
+    try:
+        start_analysis_job(
+            current_app._get_current_object(), session_id, analyze_multi,
+            os.path.abspath(original_path),
+            {annotator: os.path.abspath(path) for annotator, path in exported_paths.items()},
+            analysis_options(current_app.config)
+        )
+    except QueueFull as e:
+        current_app.extensions['retention'].release(session_dir)
+        return queue_full_response(e)
+    return jsonify({
+        'success': True,
+        'session_id': session_id,
+        'status': 'running',
+        'annotators': list(exported_paths),
+        'progress_url': url_for('main.analysis_progress', session_id=session_id)
+    }), 202
+
+@main.route('/api/analysis/status')
+def analysis_status():
+    """분석 실행기의 대기열 상태(실행 중+대기 중 작업 수, 거절된 요청 수)를 반환합니다."""
+    return jsonify(current_app.extensions['analysis_executor'].stats())
+
+@main.route('/api/progress/<session_id>')
+def analysis_progress(session_id):
+    """분석 진행 상황을 Server-Sent Events로 스트리밍합니다."""
+    broker = current_app.extensions['progress']
+    
+    if broker.latest(session_id) is None:
+        # Nothing running for this session: finished long ago or unknown
         report_filename = f"report_{session_id}.json"
         report_path = os.path.join(current_app.config['REPORTS_FOLDER'], report_filename)
-        analyzer.save_report(report, report_path)
+        if not os.path.exists(report_path):
+            return jsonify({'error': '진행 중인 분석을 찾을 수 없습니다.'}), 404
         
-        return jsonify({
-            'success': True,
-            'session_id': session_id,
-            'report_filename': report_filename,
-            'summary': {
-                'total_records': report['metadata']['total_records'],
-                'records_with_changes': report['metadata']['records_with_changes'],
-                'text_changes': report['summary']['text_changes'],
-                'description_changes': report['summary']['description_changes'],
-                'subject_count_changes': report['summary']['subject_count_changes'],
-                'pii_annotation_changes': report['summary']['pii_annotation_changes'],
-                'data_ids_removed': report['summary'].get('data_ids_removed', 0),
-                'data_ids_added': report['summary'].get('data_ids_added', 0)
-            }
+        import json
+        with open(report_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        broker.publish(session_id, 'done', summarize_report(report, session_id, report_filename))
+    
+    return Response(
+        stream_with_context(broker.stream(session_id)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@main.route('/reports')
+def list_reports():
+    # Listed from the retention index; watch daemon reports are adopted into it in the background
+    reports = []
+    for path, entry in current_app.extensions['retention'].entries('report'):
+        name = os.path.basename(path)
+        if not (name.startswith('report_') and name.endswith('.json')):
+            continue
+        reports.append({
+            'session_id': name[len('report_'):-len('.json')],
+            'filename': name,
+            'size': entry['size'],
+            'modified': datetime.fromtimestamp(entry.get('modified', entry['created']))
         })
-        
-    except Exception as e:
-        return jsonify({'error': f'분석 중 오류가 발생했습니다: {str(e)}'}), 500
+    reports.sort(key=lambda r: r['modified'], reverse=True)
+    return render_template('reports.html', reports=reports)
 
 @main.route('/report/<session_id>')
 def view_report(session_id):
@@ -86,11 +380,15 @@ def view_report(session_id):
         flash('보고서를 찾을 수 없습니다.', 'error')
         return redirect(url_for('main.index'))
     
+    current_app.extensions['retention'].touch(report_path)
+    
     try:
         import json
         with open(report_path, 'r', encoding='utf-8') as f:
             report = json.load(f)
         
+        if report.get('report_type') == 'consensus':
+            return render_template('consensus.html', report=report, session_id=session_id)
         return render_template('report.html', report=report, session_id=session_id)
     except Exception as e:
         flash(f'보고서 로드 중 오류가 발생했습니다: {str(e)}', 'error')
@@ -108,6 +406,7 @@ def download_report(session_id):
         flash('보고서를 찾을 수 없습니다.', 'error')
         # return redirect(url_for('main.index'))
     
+    current_app.extensions['retention'].touch(report_path)
     return send_file(report_path, as_attachment=True, download_name=f"analysis_report_{session_id}.json")
 
 @main.route('/api/report/<session_id>')
@@ -118,6 +417,8 @@ def api_report(session_id):
     if not os.path.exists(report_path):
         return jsonify({'error': '보고서를 찾을 수 없습니다.'}), 404
     
+    current_app.extensions['retention'].touch(report_path)
+    
     try:
         import json
         with open(report_path, 'r', encoding='utf-8') as f:
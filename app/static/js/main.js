@@ -13,13 +13,6 @@ document.addEventListener('DOMContentLoaded', function() {
         input.addEventListener('change', function() {
             const file = this.files[0];
             if (file) {
-                // Check file size (16MB limit)
-                if (file.size > 16 * 1024 * 1024) {
-                    alert('파일 크기가 16MB를 초과합니다.');
-                    this.value = '';
-                    return;
-                }
-                
                 // Check file extension
                 const allowedExtensions = ['json', 'jsonl'];
                 const fileExtension = file.name.split('.').pop().toLowerCase();
@@ -121,6 +114,149 @@ function hideProgress() {
     }
 }
 
+// Chunked upload functionality
+// Files are sent in fixed-size chunks; the server tells us where to resume,
+// so a page reload or network error only costs the chunk in flight.
+// The resume key covers every file of the form, so files that finished before
+// the interruption are not uploaded again.
+function uploadResumeKey(files, roles) {
+    return 'chunkedUpload:' + files.map((file, i) => `${roles[i]}:${file.name}:${file.size}:${file.lastModified}`).join('|');
+}
+
+// Uploads every file into one session and starts the analysis with POST /api/upload/<session_id>/<completePath>.
+// The session is remembered until that request succeeds, so a retry after any failure resumes it.
+async function uploadFilesChunked(files, roles, completePath, onProgress) {
+    const resumeKey = uploadResumeKey(files, roles);
+    const totalBytes = files.reduce((sum, file) => sum + file.size, 0);
+    let sessionId = localStorage.getItem(resumeKey);
+    let uploadedBytes = 0;
+
+    for (let i = 0; i < files.length; i++) {
+        const state = await uploadFileChunked(files[i], roles[i], sessionId, (received) => {
+            if (onProgress) {
+                onProgress(totalBytes ? Math.round((uploadedBytes + received) / totalBytes * 100) : 100);
+            }
+        }, (uploadSessionId) => localStorage.setItem(resumeKey, uploadSessionId));
+        sessionId = state.session_id;
+        uploadedBytes += files[i].size;
+    }
+
+    const job = await postJSON(`/api/upload/${sessionId}/${completePath}`, {});
+    localStorage.removeItem(resumeKey);
+    return job;
+}
+
+async function uploadFileChunked(file, role, sessionId, onProgress, onSession) {
+    let state = await postJSON('/api/upload/init', {
+        session_id: sessionId,
+        role: role,
+        filename: file.name,
+        size: file.size
+    });
+    const uploadSessionId = state.session_id;
+    if (onSession) {
+        onSession(uploadSessionId);
+    }
+
+    while (!state.complete) {
+        const start = state.next_index * state.chunk_size;
+        const chunk = file.slice(start, Math.min(start + state.chunk_size, file.size));
+        state = await putChunk(`/api/upload/${uploadSessionId}/${role}/chunk/${state.next_index}`, chunk);
+        if (onProgress) {
+            onProgress(state.received_bytes, state.total_size);
+        }
+    }
+
+    return { ...state, session_id: uploadSessionId };
+}
+
+async function putChunk(url, chunk, retries = 3) {
+    for (let attempt = 0; ; attempt++) {
+        try {
+            const response = await fetch(url, { method: 'PUT', body: chunk });
+            const result = await response.json();
+            if (response.ok) {
+                return result;
+            }
+            // Out-of-order chunk: continue from the server's position
+            if (response.status === 409 && result.state) {
+                return result.state;
+            }
+            throw new Error(result.error || '청크 업로드 실패');
+        } catch (error) {
+            if (attempt >= retries) {
+                throw error;
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)));
+        }
+    }
+}
+
+async function postJSON(url, body) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    const result = await response.json();
+    if (!response.ok) {
+        throw new Error(result.error || '요청 처리 중 오류가 발생했습니다.');
+    }
+    return result;
+}
+
+// Analysis progress (Server-Sent Events)
+const ANALYSIS_STAGE_LABELS = {
+    queued: '분석 대기 중',
+    sampling: '미리보기 표본 추출 중',
+    loading_original: '원본 파일 로드 중',
+    loading_exported: '내보낸 파일 로드 중',
+    indexing: '레코드 인덱싱 중',
+    comparing: '레코드 비교 중',
+    completed: '보고서 저장 중'
+};
+
+function subscribeProgress(sessionId, onProgress, onPreview) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`/api/progress/${sessionId}`);
+
+        source.addEventListener('progress', (e) => {
+            if (onProgress) {
+                onProgress(JSON.parse(e.data));
+            }
+        });
+        source.addEventListener('preview', (e) => {
+            if (onPreview) {
+                onPreview(JSON.parse(e.data));
+            }
+        });
+        source.addEventListener('done', (e) => {
+            source.close();
+            resolve(JSON.parse(e.data));
+        });
+        source.addEventListener('error', (e) => {
+            // Named 'error' events carry a payload; bare ones are connection
+            // drops, which EventSource retries on its own.
+            if (e.data) {
+                source.close();
+                reject(new Error(JSON.parse(e.data).error));
+            }
+        });
+    });
+}
+
+function formatProgress(event) {
+    const label = ANALYSIS_STAGE_LABELS[event.stage] || event.stage;
+    if (!event.total) {
+        return label;
+    }
+    let text = `${label} (${event.processed.toLocaleString()} / ${event.total.toLocaleString()})`;
+    if (event.eta !== null && event.eta !== undefined) {
+        text += ` · 남은 시간 약 ${Math.ceil(event.eta)}초`;
+    }
+    return text;
+}
+
 // Export functionality
 function exportToCSV(data, filename) {
     const csv = convertToCSV(data);
@@ -1,47 +1,295 @@
 import json
+import bisect
 import difflib
 from datetime import datetime
 import os
-from typing import Dict, List, Any, Tuple
+import re
+import math
+import time
+import random
+from collections import Counter
+from typing import Dict, List, Any, Tuple, Callable, Optional
+
+from core.lazy_record import LazyRecord
+from core.token_cache import TokenCache
 
 
 class JSONAnalyzer:
     """JSON 파일 비교 및 분석을 위한 클래스"""
     
-    def __init__(self):
+    # Per-record text diff budget; records over budget fall back to a coarser granularity
+    DEFAULT_TEXT_DIFF_BUDGET = {
+        "max_edit_distance": 20000,  # estimated changed characters for character-level diff
+        "max_opcodes": 1000,         # changes listed per record at any granularity
+        "time_limit": 2.0            # seconds per record for detailed diffs; best-effort, see analyze_text_differences
+    }
+    # Initial seconds per character (both texts) of each granularity, refined by measured diffs
+    TEXT_DIFF_COST = {"character": 1.2e-6, "word": 6e-7, "token": 7e-7, "line": 5e-7}
+    TEXT_DIFF_COST_MIN_CHARS = 10000  # shorter diffs are dominated by fixed overhead and not measured
+    TEXT_DIFF_GRANULARITIES = ("character", "word", "line", "summary")
+    # Fallback ladder per diff mode, finest first; "summary" always succeeds
+    TEXT_DIFF_MODES = {
+        "character": TEXT_DIFF_GRANULARITIES,
+        "token": ("token", "line", "summary")
+    }
+    # token_changes entries are lists in this field order; spans are character offsets
+    TOKEN_CHANGE_FIELDS = ("type", "original_tokens", "exported_tokens",
+                           "original_span", "exported_span", "original_text", "exported_text")
+    WORD_PATTERN = re.compile(r'\S+|\s+')
+    
+    # Preview counters: binary ones are "records with X", the rest are per-record counts
+    PREVIEW_BINARY_COUNTERS = ("records_with_changes", "text_changes", "subject_count_changes", "identical_text_content")
+    PREVIEW_COUNT_COUNTERS = ("description_changes", "pii_annotation_changes", "missing_metadata_fields")
+    PREVIEW_Z = 1.96  # 95% confidence
+    
+    def __init__(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 progress_interval: float = 0.5,
+                 text_diff_budget: Optional[Dict[str, Any]] = None,
+                 text_diff_mode: str = "character",
+                 token_cache: Optional[TokenCache] = None):
+        if text_diff_mode not in self.TEXT_DIFF_MODES:
+            raise ValueError(f"알 수 없는 텍스트 분석 모드: {text_diff_mode}")
         self.ignored_fields = ["provenance"]
+        self.text_diff_budget = {**self.DEFAULT_TEXT_DIFF_BUDGET, **(text_diff_budget or {})}
+        self.text_diff_mode = text_diff_mode
+        # Share one cache between analyzers to reuse the original's tokenization across exports
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        self.text_diff_cost = dict(self.TEXT_DIFF_COST)
+        # progress_callback(event)은 진행 단계, 처리 레코드 수, ETA, 중간 요약을 받습니다.
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self._stage = None
+        self._stage_started = 0.0
+        self._last_progress = 0.0
     
-    def load_jsonl_file(self, file_path: str) -> List[Dict]:
-        """JSONL 파일을 로드합니다."""
+    def load_jsonl_file(self, file_path: str) -> List[LazyRecord]:
+        """JSONL 파일을 로드합니다.
+        
+        각 레코드는 LazyRecord로, metadata만 파싱하고 text/subjects는 비교에 필요할 때 디코딩합니다.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return [json.loads(line.strip()) for line in f if line.strip()]
+            records = []
+            with open(file_path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        records.append(LazyRecord(line))
+            return records
         except Exception as e:
             raise Exception(f"파일 로드 실패: {str(e)}")
     
     def analyze_text_differences(self, orig_text: str, exp_text: str) -> Dict[str, Any]:
-        """텍스트 차이점을 분석합니다."""
+        """텍스트 차이점을 분석합니다.
+        
+        text_diff_budget을 넘는 레코드는 문자 -> 단어 -> 라인 -> 요약 순으로
+        (token 모드에서는 토큰 -> 라인 -> 요약 순으로) 더 거친 단위로 분석하며,
+        사용한 단위를 granularity에 기록합니다.
+        
+        time_limit은 최선 노력 기준입니다. 단위마다 텍스트 길이로 소요 시간을 추정해 남은 시간을 넘을
+        단위는 건너뛰지만, 실행을 시작한 diff는 중단하지 않습니다. 추정이 빗나가 제한을 넘기면 결과는
+        그대로 쓰고 fallback_reason에 "time_limit"을 기록합니다.
+        """
         if orig_text == exp_text:
             return {"identical": True}
         
+        text_changes = {
+            "identical": False,
+            "original_length": len(orig_text),
+            "exported_length": len(exp_text),
+            "length_difference": len(exp_text) - len(orig_text)
+        }
+        
+        deadline = time.monotonic() + self.text_diff_budget["time_limit"]
+        text_size = len(orig_text) + len(exp_text)
+        granularity = "summary"
+        fallback_reason = None
+        for candidate in self.TEXT_DIFF_MODES[self.text_diff_mode][:-1]:
+            started = time.monotonic()
+            if started + self.text_diff_cost[candidate] * text_size > deadline:
+                # A coarser granularity is cheaper and may still fit
+                fallback_reason = "time_limit"
+                continue
+            
+            changes, reason = self._diff_text_at(candidate, orig_text, exp_text)
+            finished = time.monotonic()
+            if changes is not None:
+                self._update_text_diff_cost(candidate, text_size, finished - started)
+                text_changes.update(changes)
+                granularity = candidate
+                if finished > deadline:
+                    fallback_reason = "time_limit"
+                break
+            fallback_reason = reason
+        
+        text_changes["granularity"] = granularity
+        if fallback_reason:
+            text_changes["fallback_reason"] = fallback_reason
+        return text_changes
+    
+    def _update_text_diff_cost(self, granularity: str, text_size: int, elapsed: float) -> None:
+        """측정한 diff 시간으로 단위별 문자당 비용 추정치를 갱신합니다."""
+        if text_size < self.TEXT_DIFF_COST_MIN_CHARS:
+            return
+        # Moving average, so one unusually fast or slow record does not swing the estimate
+        self.text_diff_cost[granularity] = 0.7 * self.text_diff_cost[granularity] + 0.3 * elapsed / text_size
+    
+    def _diff_text_at(self, granularity: str, orig_text: str, exp_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """주어진 단위로 차이를 계산합니다. 예산을 넘으면 (None, 사유)를 반환합니다."""
+        max_opcodes = self.text_diff_budget["max_opcodes"]
+        
+        if granularity == "line":
+            line_differences = self._line_differences(orig_text, exp_text)
+            if len(line_differences) > max_opcodes:
+                return None, "max_opcodes"
+            return {"line_differences": line_differences}, None
+        
+        if granularity == "token":
+            return self._token_diff(orig_text, exp_text)
+        
+        if granularity == "character":
+            orig_units, exp_units = orig_text, exp_text
+        else:
+            orig_units = self.WORD_PATTERN.findall(orig_text)
+            exp_units = self.WORD_PATTERN.findall(exp_text)
+        
+        matcher = difflib.SequenceMatcher(None, orig_units, exp_units)
+        if granularity == "character":
+            # quick_ratio() is an upper bound on similarity, so this is a lower
+            # bound on the number of changed characters; cheap to compute.
+            min_edit_distance = (len(orig_text) + len(exp_text)) * (1 - matcher.quick_ratio())
+            if min_edit_distance > self.text_diff_budget["max_edit_distance"]:
+                return None, "max_edit_distance"
+        
+        opcodes = [op for op in matcher.get_opcodes() if op[0] != 'equal']
+        if len(opcodes) > max_opcodes:
+            return None, "max_opcodes"
+        
+        if granularity == "character":
+            return {
+                "line_differences": self._line_differences(orig_text, exp_text),
+                "character_changes": [
+                    {
+                        "type": tag,
+                        "original_text": orig_text[i1:i2],
+                        "exported_text": exp_text[j1:j2],
+                        "original_position": i1,
+                        "exported_position": j1
+                    }
+                    for tag, i1, i2, j1, j2 in opcodes
+                ]
+            }, None
+        
+        # Word opcodes index tokens; map them back to character offsets
+        orig_offsets = self._token_offsets(orig_units)
+        exp_offsets = self._token_offsets(exp_units)
+        return {
+            "word_changes": [
+                {
+                    "type": tag,
+                    "original_text": orig_text[orig_offsets[i1]:orig_offsets[i2]],
+                    "exported_text": exp_text[exp_offsets[j1]:exp_offsets[j2]],
+                    "original_position": orig_offsets[i1],
+                    "exported_position": exp_offsets[j1]
+                }
+                for tag, i1, i2, j1, j2 in opcodes
+            ]
+        }, None
+    
+    def _token_diff(self, orig_text: str, exp_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """캐시된 토큰화로 토큰 단위 차이를 계산합니다.
+        
+        변경마다 TOKEN_CHANGE_FIELDS 순서의 리스트 하나를 기록합니다. (토큰 범위와 문자 오프셋 포함)
+        """
+        orig_tokens, orig_offsets = self.token_cache.tokenize(orig_text)
+        exp_tokens, exp_offsets = self.token_cache.tokenize(exp_text)
+        
+        opcodes = self._token_opcodes(orig_tokens, exp_tokens)
+        if len(opcodes) > self.text_diff_budget["max_opcodes"]:
+            return None, "max_opcodes"
+        
+        token_changes = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            orig_start, orig_end = orig_offsets[i1], orig_offsets[i2]
+            exp_start, exp_end = exp_offsets[j1], exp_offsets[j2]
+            token_changes.append([
+                tag, [i1, i2], [j1, j2], [orig_start, orig_end], [exp_start, exp_end],
+                orig_text[orig_start:orig_end], exp_text[exp_start:exp_end]
+            ])
+        
+        return {
+            "token_count": {"original": len(orig_tokens), "exported": len(exp_tokens)},
+            "token_changes": token_changes
+        }, None
+    
+    def _token_opcodes(self, orig_tokens: Tuple[str, ...], exp_tokens: Tuple[str, ...]) -> List[Tuple[str, int, int, int, int]]:
+        """토큰 시퀀스의 변경 구간(equal 제외)을 SequenceMatcher opcode 형식으로 계산합니다.
+        
+        양쪽에 한 번씩만 나오는 토큰을 기준점으로 삼고(patience diff), 기준점 사이에서 내용이 다른
+        짧은 구간만 SequenceMatcher로 비교합니다. 흔한 토큰이 많은 긴 문서에서도 비교량이 작게 유지됩니다.
+        """
+        orig_counts = Counter(orig_tokens)
+        exp_counts = Counter(exp_tokens)
+        exp_unique = {token: j for j, token in enumerate(exp_tokens) if exp_counts[token] == 1}
+        candidates = [
+            (i, exp_unique[token]) for i, token in enumerate(orig_tokens)
+            if orig_counts[token] == 1 and token in exp_unique
+        ]
+        
+        opcodes = []
+        i = j = 0
+        for anchor_i, anchor_j in self._increasing_anchors(candidates) + [(len(orig_tokens), len(exp_tokens))]:
+            orig_gap = orig_tokens[i:anchor_i]
+            exp_gap = exp_tokens[j:anchor_j]
+            if orig_gap != exp_gap:
+                if not orig_gap:
+                    opcodes.append(('insert', i, i, j, anchor_j))
+                elif not exp_gap:
+                    opcodes.append(('delete', i, anchor_i, j, j))
+                else:
+                    matcher = difflib.SequenceMatcher(None, orig_gap, exp_gap)
+                    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                        if tag != 'equal':
+                            opcodes.append((tag, i + i1, i + i2, j + j1, j + j2))
+            i, j = anchor_i + 1, anchor_j + 1
+        return opcodes
+    
+    @staticmethod
+    def _increasing_anchors(candidates: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """(i, j) 후보 중 i, j가 모두 증가하는 가장 긴 부분열을 찾습니다. (후보는 i 순으로 정렬됨)"""
+        tail_indexes: List[int] = []  # candidate index ending the best chain of each length
+        tail_js: List[int] = []
+        previous = [-1] * len(candidates)
+        for index, (_, j) in enumerate(candidates):
+            length = bisect.bisect_left(tail_js, j)
+            if length:
+                previous[index] = tail_indexes[length - 1]
+            if length == len(tail_js):
+                tail_indexes.append(index)
+                tail_js.append(j)
+            else:
+                tail_indexes[length] = index
+                tail_js[length] = j
+        
+        chain = []
+        index = tail_indexes[-1] if tail_indexes else -1
+        while index != -1:
+            chain.append(candidates[index])
+            index = previous[index]
+        chain.reverse()
+        return chain
+    
+    def _line_differences(self, orig_text: str, exp_text: str) -> List[Dict[str, str]]:
+        """unified diff에서 추가/삭제된 라인을 추출합니다."""
+        line_differences = []
+        
         # Use difflib to find differences
-        diff = list(difflib.unified_diff(
+        diff = difflib.unified_diff(
             orig_text.splitlines(keepends=True),
             exp_text.splitlines(keepends=True),
             fromfile='original',
             tofile='exported',
             lineterm=''
-        ))
-        
-        # Extract meaningful changes
-        text_changes = {
-            "identical": False,
-            "original_length": len(orig_text),
-            "exported_length": len(exp_text),
-            "length_difference": len(exp_text) - len(orig_text),
-            "line_differences": [],
-            "character_changes": []
-        }
+        )
         
         # Process unified diff
         for line in diff:
@@ -50,29 +298,24 @@ class JSONAnalyzer:
             elif line.startswith('---') or line.startswith('+++'):
                 continue
             elif line.startswith('-'):
-                text_changes["line_differences"].append({
+                line_differences.append({
                     "type": "removed",
                     "content": line[1:].rstrip()
                 })
             elif line.startswith('+'):
-                text_changes["line_differences"].append({
+                line_differences.append({
                     "type": "added", 
                     "content": line[1:].rstrip()
                 })
         
-        # Find character-level differences using SequenceMatcher
-        matcher = difflib.SequenceMatcher(None, orig_text, exp_text)
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            if tag != 'equal':
-                text_changes["character_changes"].append({
-                    "type": tag,
-                    "original_text": orig_text[i1:i2],
-                    "exported_text": exp_text[j1:j2],
-                    "original_position": i1,
-                    "exported_position": j1
-                })
-        
-        return text_changes
+        return line_differences
+    
+    def _token_offsets(self, tokens: List[str]) -> List[int]:
+        """토큰 시작 위치(문자 오프셋) 목록을 만듭니다. 마지막 값은 전체 길이입니다."""
+        offsets = [0]
+        for token in tokens:
+            offsets.append(offsets[-1] + len(token))
+        return offsets
     
     def compare_metadata(self, orig_meta: Dict, exp_meta: Dict) -> Dict[str, Any]:
         """메타데이터를 비교합니다."""
@@ -236,22 +479,69 @@ class JSONAnalyzer:
     def analyze_files(self, original_file: str, exported_file: str) -> Dict[str, Any]:
         """두 JSONL 파일을 비교 분석합니다."""
         # Load files
+        self._report_progress("loading_original", force=True)
         original = self.load_jsonl_file(original_file)
+        self._report_progress("loading_exported", force=True)
         exported = self.load_jsonl_file(exported_file)
         
+        return self.analyze_records(
+            original,
+            exported,
+            os.path.basename(original_file),
+            os.path.basename(exported_file)
+        )
+    
+    def index_records(self, records: List[Dict]) -> Dict[Any, Dict]:
+        """레코드 목록을 data_id 기준으로 인덱싱합니다."""
+        return {record['metadata']['data_id']: record for record in records}
+    
+    def analyze_records(self, original: List[Dict], exported: List[Dict],
+                        original_name: str, exported_name: str,
+                        orig_by_id: Dict[Any, Dict] = None,
+                        exp_by_id: Dict[Any, Dict] = None) -> Dict[str, Any]:
+        """이미 로드된 레코드 목록을 비교 분석합니다.
+        
+        orig_by_id/exp_by_id를 넘기면 해당 인덱스를 다시 만들지 않습니다.
+        """
         # Create lookups
-        orig_by_id = {record['metadata']['data_id']: record for record in original}
-        exp_by_id = {record['metadata']['data_id']: record for record in exported}
+        self._report_progress("indexing", force=True)
+        if orig_by_id is None:
+            orig_by_id = self.index_records(original)
+        if exp_by_id is None:
+            exp_by_id = self.index_records(exported)
+        
+        report = self.new_report(original_name, exported_name, len(original))
+        self.set_id_changes(report, orig_by_id.keys(), exp_by_id.keys())
+        
+        total = len(orig_by_id)
+        self._report_progress("comparing", 0, total, report, force=True)
+        
+        for processed, data_id in enumerate(orig_by_id.keys(), 1):
+            self._report_progress("comparing", processed, total, report)
+            if data_id not in exp_by_id:
+                # already accounted as missing; skip detailed comparison
+                continue
+            
+            record_changes = self.compare_record(orig_by_id[data_id], exp_by_id[data_id])
+            self.add_record_changes(report, data_id, record_changes)
+        
+        self._report_progress("completed", total, total, report, force=True)
         
-        # Initialize report structure
+        return report
+    
+    def new_report(self, original_name: str, exported_name: str, total_records: int) -> Dict[str, Any]:
+        """빈 보고서 구조를 만듭니다."""
         report = {
             "metadata": {
                 "comparison_timestamp": datetime.now().isoformat(),
-                "original_file": os.path.basename(original_file),
-                "exported_file": os.path.basename(exported_file),
-                "total_records": len(original),
+                "original_file": original_name,
+                "exported_file": exported_name,
+                "total_records": total_records,
                 "records_with_changes": 0,
-                "ignored_fields": self.ignored_fields
+                "ignored_fields": self.ignored_fields,
+                "text_diff_budget": self.text_diff_budget,
+                "text_diff_mode": self.text_diff_mode,
+                "text_diff_granularity": {granularity: 0 for granularity in self.TEXT_DIFF_MODES[self.text_diff_mode]}
             },
             "summary": {
                 "missing_metadata_fields": 0,
@@ -269,12 +559,14 @@ class JSONAnalyzer:
                 "added_in_exported": []
             }
         }
-        
-        identical_text_count = 0
-        
-        # Compute data_id additions/removals
-        orig_ids = set(orig_by_id.keys())
-        exp_ids = set(exp_by_id.keys())
+        if self.text_diff_mode == "token":
+            report["metadata"]["token_change_fields"] = list(self.TOKEN_CHANGE_FIELDS)
+        return report
+    
+    def set_id_changes(self, report: Dict[str, Any], orig_ids, exp_ids) -> None:
+        """data_id 추가/삭제 내역을 보고서에 기록합니다."""
+        orig_ids = set(orig_ids)
+        exp_ids = set(exp_ids)
         missing_in_exported = sorted(list(orig_ids - exp_ids))
         added_in_exported = sorted(list(exp_ids - orig_ids))
         
@@ -282,63 +574,244 @@ class JSONAnalyzer:
         report["id_changes"]["added_in_exported"] = added_in_exported
         report["summary"]["data_ids_removed"] = len(missing_in_exported)
         report["summary"]["data_ids_added"] = len(added_in_exported)
+    
+    def compare_record(self, orig: Dict, exp: Dict) -> Dict[str, Any]:
+        """data_id가 같은 두 레코드를 비교합니다.
         
-        for data_id in orig_by_id.keys():
-            if data_id not in exp_by_id:
-                # already accounted as missing; skip detailed comparison
-                continue
-                
-            orig = orig_by_id[data_id]
-            exp = exp_by_id[data_id]
-            
-            record_changes = {
-                "metadata_changes": {},
-                "subject_count_change": None,
-                "text_identical": orig['text'] == exp['text'],
-                "text_changes": None,
-                "subject_changes": []
-            }
-            
-            has_changes = False
-            
-            # Check text identity and analyze differences
-            if record_changes["text_identical"]:
-                identical_text_count += 1
-            else:
-                text_changes = self.analyze_text_differences(orig['text'], exp['text'])
-                record_changes["text_changes"] = text_changes
-                has_changes = True
-                report["summary"]["text_changes"] += 1
-            
-            # Check metadata changes
-            metadata_changes = self.compare_metadata(orig['metadata'], exp['metadata'])
-            if metadata_changes:
-                record_changes["metadata_changes"] = metadata_changes
-                has_changes = True
-                report["summary"]["missing_metadata_fields"] += len([k for k, v in metadata_changes.items() if v["type"] == "missing"])
-            
-            # Check subject changes
+        LazyRecord끼리는 원본 바이트가 같은 필드를 디코딩하지 않고 건너뜁니다.
+        """
+        if isinstance(orig, LazyRecord) and isinstance(exp, LazyRecord) and orig.raw == exp.raw:
+            return self.unchanged_record()
+        
+        record_changes = self.unchanged_record()
+        record_changes["text_identical"] = LazyRecord.same_value(orig, exp, 'text') or orig['text'] == exp['text']
+        
+        # Check text identity and analyze differences
+        if not record_changes["text_identical"]:
+            record_changes["text_changes"] = self.analyze_text_differences(orig['text'], exp['text'])
+        
+        # Check metadata changes
+        metadata_changes = self.compare_metadata(orig['metadata'], exp['metadata'])
+        if metadata_changes:
+            record_changes["metadata_changes"] = metadata_changes
+        
+        # Check subject changes
+        if not LazyRecord.same_value(orig, exp, 'subjects'):
             subject_count_change, subject_changes = self.compare_subjects(orig['subjects'], exp['subjects'])
             if subject_count_change:
                 record_changes["subject_count_change"] = subject_count_change
-                has_changes = True
-                report["summary"]["subject_count_changes"] += 1
-            
             if subject_changes:
                 record_changes["subject_changes"] = subject_changes
-                has_changes = True
-                report["summary"]["description_changes"] += len([s for s in subject_changes if "description" in s["changes"]])
-                report["summary"]["pii_annotation_changes"] += len([s for s in subject_changes if "pii_changes" in s["changes"]])
-            
-            if has_changes:
-                report["changes_by_record"][data_id] = record_changes
-                report["metadata"]["records_with_changes"] += 1
         
-        report["summary"]["identical_text_content"] = identical_text_count
+        return record_changes
+    
+    @staticmethod
+    def unchanged_record() -> Dict[str, Any]:
+        """변경사항이 없는 레코드의 compare_record 결과입니다."""
+        return {
+            "metadata_changes": {},
+            "subject_count_change": None,
+            "text_identical": True,
+            "text_changes": None,
+            "subject_changes": []
+        }
+    
+    @staticmethod
+    def record_counters(record_changes: Dict[str, Any]) -> Dict[str, int]:
+        """compare_record 결과 하나가 요약 카운터에 더하는 값입니다. (records_with_changes 포함)"""
+        text_changed = not record_changes["text_identical"]
+        metadata_changes = record_changes["metadata_changes"]
+        subject_changes = record_changes["subject_changes"]
+        has_changes = text_changed or bool(metadata_changes) or bool(record_changes["subject_count_change"]) or bool(subject_changes)
+        return {
+            "records_with_changes": 1 if has_changes else 0,
+            "text_changes": 1 if text_changed else 0,
+            "identical_text_content": 0 if text_changed else 1,
+            "subject_count_changes": 1 if record_changes["subject_count_change"] else 0,
+            "missing_metadata_fields": len([k for k, v in metadata_changes.items() if v["type"] == "missing"]),
+            "description_changes": len([s for s in subject_changes if "description" in s["changes"]]),
+            "pii_annotation_changes": len([s for s in subject_changes if "pii_changes" in s["changes"]])
+        }
+    
+    def add_record_changes(self, report: Dict[str, Any], data_id: Any, record_changes: Dict[str, Any]) -> None:
+        """compare_record 결과를 보고서 요약과 changes_by_record에 반영합니다."""
+        counters = self.record_counters(record_changes)
+        for counter, value in counters.items():
+            if counter != "records_with_changes":
+                report["summary"][counter] += value
+        
+        if not record_changes["text_identical"]:
+            report["metadata"]["text_diff_granularity"][record_changes["text_changes"]["granularity"]] += 1
+        
+        if counters["records_with_changes"]:
+            report["changes_by_record"][data_id] = record_changes
+            report["metadata"]["records_with_changes"] += 1
+    
+    def _report_progress(self, stage: str, processed: int = 0, total: int = 0,
+                         report: Dict[str, Any] = None, force: bool = False) -> None:
+        """progress_callback으로 진행 상황을 전달합니다. progress_interval 초 간격으로 제한됩니다."""
+        if self.progress_callback is None:
+            return
+        
+        now = time.monotonic()
+        if stage != self._stage:
+            self._stage = stage
+            self._stage_started = now
+        elif not force and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        
+        elapsed = now - self._stage_started
+        eta = None
+        if 0 < processed < total:
+            eta = round(elapsed / processed * (total - processed), 1)
+        
+        event = {
+            "stage": stage,
+            "processed": processed,
+            "total": total,
+            "percent": round(processed / total * 100, 1) if total else None,
+            "elapsed": round(elapsed, 1),
+            "eta": eta
+        }
+        if report is not None:
+            # Partial counters so far; copied because the report keeps changing
+            event["summary"] = dict(report["summary"])
+            event["records_with_changes"] = report["metadata"]["records_with_changes"]
+        
+        self.progress_callback(event)
+    
+    def preview_files(self, original_file: str, exported_file: str,
+                      sample_size: int = 200, seed: Optional[int] = None) -> Dict[str, Any]:
+        """data_id를 reservoir sampling하여 표본만 분석하는 빠른 미리보기 보고서를 만듭니다.
+        
+        두 파일을 한 번씩 스트리밍하며 data_id만 추출하고, 표본 레코드만 JSON으로 파싱합니다.
+        data_id 추가/삭제는 전체 기준으로 정확히 계산되며, 나머지 요약 값은 신뢰구간과 함께 추정됩니다.
+        """
+        rng = random.Random(seed)
+        
+        self._report_progress("sampling", force=True)
+        orig_ids = set()
+        reservoir = []
+        total_records = 0
+        for record in self._iter_records(original_file):
+            orig_ids.add(record.data_id)
+            if len(reservoir) < sample_size:
+                reservoir.append(record)
+            else:
+                j = rng.randint(0, total_records)
+                if j < sample_size:
+                    reservoir[j] = record
+            total_records += 1
+        
+        sampled_ids = {record.data_id for record in reservoir}
+        exp_ids = set()
+        exported_sample = []
+        for record in self._iter_records(exported_file):
+            exp_ids.add(record.data_id)
+            if record.data_id in sampled_ids:
+                exported_sample.append(record)
+        
+        return self._preview_report(
+            reservoir,
+            exported_sample,
+            orig_ids,
+            exp_ids,
+            total_records,
+            os.path.basename(original_file),
+            os.path.basename(exported_file)
+        )
+    
+    def _iter_records(self, file_path: str):
+        """JSONL 파일을 스트리밍하며 LazyRecord를 생성합니다. 레코드마다 metadata만 디코딩합니다."""
+        try:
+            with open(file_path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield LazyRecord(line)
+        except Exception as e:
+            raise Exception(f"파일 로드 실패: {str(e)}")
+    
+    def _preview_report(self, original_sample: List[Dict], exported_sample: List[Dict],
+                        orig_ids: set, exp_ids: set, total_records: int,
+                        original_name: str, exported_name: str) -> Dict[str, Any]:
+        """표본 분석 결과를 전체 규모로 외삽하고 신뢰구간을 붙입니다."""
+        report = self.analyze_records(original_sample, exported_sample, original_name, exported_name)
+        
+        # data_id additions/removals are exact: every id was read while sampling
+        missing_in_exported = sorted(list(orig_ids - exp_ids))
+        added_in_exported = sorted(list(exp_ids - orig_ids))
+        report["id_changes"]["missing_in_exported"] = missing_in_exported
+        report["id_changes"]["added_in_exported"] = added_in_exported
+        report["summary"]["data_ids_removed"] = len(missing_in_exported)
+        report["summary"]["data_ids_added"] = len(added_in_exported)
+        report["metadata"]["total_records"] = total_records
+        
+        # Per-record counter values over sampled records present in both files
+        compared_ids = {record['metadata']['data_id'] for record in original_sample} & exp_ids
+        population = len(orig_ids & exp_ids)
+        values = {counter: [] for counter in self.PREVIEW_BINARY_COUNTERS + self.PREVIEW_COUNT_COUNTERS}
+        for data_id in compared_ids:
+            # Same per-record counters as add_record_changes, so preview and full reports agree
+            changes = report["changes_by_record"].get(data_id) or self.unchanged_record()
+            for counter, value in self.record_counters(changes).items():
+                values[counter].append(value)
         
+        estimates = {}
+        for counter, counter_values in values.items():
+            estimate = self._estimate_total(counter_values, population, counter in self.PREVIEW_BINARY_COUNTERS)
+            estimates[counter] = estimate
+            if counter == "records_with_changes":
+                report["metadata"]["records_with_changes"] = estimate["estimate"]
+            else:
+                report["summary"][counter] = estimate["estimate"]
+        
+        report["preview"] = {
+            "sample_size": len(compared_ids),
+            "population": population,
+            "confidence": 0.95,
+            "estimates": estimates
+        }
         return report
     
+    def _estimate_total(self, values: List[int], population: int, binary: bool) -> Dict[str, Any]:
+        """표본 값으로 모집단 합계와 95% 신뢰구간을 추정합니다.
+        
+        이진 값은 Wilson 구간을, 개수 값은 유한모집단 보정을 적용한 정규 근사를 사용합니다.
+        """
+        n = len(values)
+        sample_count = sum(values)
+        if n == 0:
+            return {"estimate": 0, "lower": 0, "upper": population, "sample_count": 0}
+        if n >= population:
+            # The sample is the whole population: exact
+            return {"estimate": sample_count, "lower": sample_count, "upper": sample_count, "sample_count": sample_count}
+        
+        z = self.PREVIEW_Z
+        mean = sample_count / n
+        if binary:
+            denominator = 1 + z * z / n
+            center = (mean + z * z / (2 * n)) / denominator
+            margin = z * math.sqrt(mean * (1 - mean) / n + z * z / (4 * n * n)) / denominator
+            lower, upper = center - margin, center + margin
+        else:
+            variance = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+            fpc = math.sqrt((population - n) / (population - 1)) if population > 1 else 0.0
+            margin = z * math.sqrt(variance / n) * fpc
+            lower, upper = mean - margin, mean + margin
+        
+        return {
+            "estimate": round(mean * population),
+            "lower": max(0, math.floor(lower * population)),
+            "upper": min(population, math.ceil(upper * population)) if binary else math.ceil(upper * population),
+            "sample_count": sample_count
+        }
+    
     def save_report(self, report: Dict[str, Any], output_path: str) -> None:
         """분석 결과를 JSON 파일로 저장합니다."""
-        with open(output_path, 'w', encoding='utf-8') as f:
+        # Write then rename so readers never see a half-written report (previews get replaced)
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, output_path)
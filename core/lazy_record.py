@@ -0,0 +1,172 @@
+import re
+import json
+import hashlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Everything up to the next bracket outside a string, so nested values are skipped bracket by bracket
+NEXT_BRACKET_PATTERN = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*[\[\]{}]')
+KEY_PATTERN = re.compile(rb'\s*("[^"\\]*(?:\\.[^"\\]*)*")\s*:\s*')
+SEPARATOR_PATTERN = re.compile(rb'\s*([,}])')
+SCALAR_PATTERN = re.compile(rb'[^,}\]\s]+')
+EMPTY_OBJECT_PATTERN = re.compile(rb'\s*}')
+OPENING_BYTES = (ord('{'), ord('['))
+BACKSLASH = ord('\\')
+
+
+class LazyRecord(Mapping):
+    """JSONL 한 라인을 원본 바이트로 보관하고, 필요한 필드만 디코딩하는 읽기 전용 레코드
+
+    생성 시에는 metadata만 디코딩하여 data_id를 얻습니다. text, subjects 같은 나머지 필드는
+    처음 접근할 때 해당 바이트 구간만 json.loads 하므로, 원본 바이트가 같아 비교가 필요 없는
+    레코드는 끝까지 디코딩되지 않습니다. 라인 지문(digest)도 처음 요청될 때 계산합니다.
+    최상위 키가 중복되면 json.loads와 달리 첫 번째 값을 사용합니다.
+    """
+
+    __slots__ = ('raw', 'data_id', '_digest', '_spans', '_scan_pos', '_values')
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._digest: Optional[bytes] = None
+        # top-level key -> (start, end) of its value in raw; filled in as the scan advances
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._values: Dict[str, Any] = {}
+
+        start = raw.find(b'{')
+        if start == -1 or raw[:start].strip():
+            raise ValueError("JSON 객체가 아닙니다.")
+        self._scan_pos: Optional[int] = None if EMPTY_OBJECT_PATTERN.match(raw, start + 1) else start + 1
+
+        # Through the scanner, so a "data_id" key nested elsewhere in the line is never picked up
+        try:
+            self.data_id = self['metadata']['data_id']
+        except (KeyError, TypeError):
+            raise KeyError('metadata.data_id')
+
+    @property
+    def digest(self) -> bytes:
+        """라인 전체의 128비트 blake2b 지문."""
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.raw, digest_size=16).digest()
+        return self._digest
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        span = self._span(key)
+        if span is None:
+            raise KeyError(key)
+        value = json.loads(self.raw[span[0]:span[1]])
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        self._scan()
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        self._scan()
+        return len(self._spans)
+
+    def __contains__(self, key) -> bool:
+        return self._span(key) is not None
+
+    def __repr__(self) -> str:
+        return f"LazyRecord(data_id={self.data_id!r}, {len(self.raw)} bytes)"
+
+    def raw_value(self, key: str) -> Optional[bytes]:
+        """필드 값의 원본 JSON 바이트를 디코딩 없이 반환합니다. 없으면 None."""
+        span = self._span(key)
+        return None if span is None else self.raw[span[0]:span[1]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    def _span(self, key: str) -> Optional[Tuple[int, int]]:
+        if key not in self._spans:
+            self._scan(until=key)
+        return self._spans.get(key)
+
+    def _scan(self, until: Optional[str] = None) -> None:
+        """최상위 키를 차례로 찾아 값의 구간을 기록합니다. until 키를 찾으면 멈춥니다.
+
+        값은 건너뛰기만 하고 디코딩하지 않습니다. 문자열은 bytes.find로 건너뜁니다.
+        """
+        raw = self.raw
+        pos = self._scan_pos
+        while pos is not None:
+            match = KEY_PATTERN.match(raw, pos)
+            if not match:
+                raise ValueError(f"잘못된 JSON (위치 {pos})")
+            key = self._decode_scalar(match.group(1))
+            start = match.end()
+            end = self._skip_value(start)
+            self._spans[key] = (start, end)
+
+            separator = SEPARATOR_PATTERN.match(raw, end)
+            if not separator:
+                raise ValueError(f"잘못된 JSON (위치 {end})")
+            pos = separator.end() if separator.group(1) == b',' else None
+            self._scan_pos = pos
+            if key == until:
+                return
+
+    def _skip_value(self, start: int) -> int:
+        raw = self.raw
+        first = raw[start:start + 1]
+        if first == b'"':
+            return self._skip_string(start)
+        if first in (b'{', b'['):
+            depth = 0
+            pos = start
+            while True:
+                match = NEXT_BRACKET_PATTERN.match(raw, pos)
+                if not match:
+                    break
+                pos = match.end()
+                if raw[pos - 1] in OPENING_BYTES:
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return pos
+        else:
+            match = SCALAR_PATTERN.match(raw, start)
+        if not match:
+            raise ValueError(f"잘못된 JSON (위치 {start})")
+        return match.end()
+
+    def _skip_string(self, start: int) -> int:
+        # bytes.find is far faster than a regex over long text values
+        raw = self.raw
+        pos = start + 1
+        while True:
+            end = raw.find(b'"', pos)
+            if end == -1:
+                raise ValueError(f"잘못된 JSON (위치 {start})")
+            backslashes = 0
+            while raw[end - 1 - backslashes] == BACKSLASH:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return end + 1
+            pos = end + 1
+
+    @staticmethod
+    def _decode_scalar(value: bytes) -> Any:
+        # Plain keys and ids skip json.loads, whose per-call overhead dominates for short values
+        if value[:1] == b'"' and b'\\' not in value:
+            return value[1:-1].decode('utf-8')
+        if value.isdigit():
+            return int(value)
+        return json.loads(value)
+
+    @staticmethod
+    def same_value(a: Mapping, b: Mapping, key: str) -> bool:
+        """두 레코드의 필드가 바이트 단위로 같으면 True. 다르거나 판단할 수 없으면 False.
+
+        False가 값이 다르다는 뜻은 아닙니다. (예: 이스케이프 방식만 다른 경우) 그때는 디코딩해서 비교합니다.
+        """
+        if not (isinstance(a, LazyRecord) and isinstance(b, LazyRecord)):
+            return False
+        a_raw = a.raw_value(key)
+        return a_raw is not None and a_raw == b.raw_value(key)
@@ -0,0 +1,262 @@
+import os
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import combinations
+from typing import Dict, List, Any, Tuple, Callable, Optional
+
+from core.analyzer import JSONAnalyzer
+from core.token_cache import TokenCache
+
+ABSENT = "<absent>"
+
+
+class MultiAnnotatorAnalyzer:
+    """원본 하나와 여러 어노테이터의 내보낸 파일을 한 번에 비교하는 클래스
+
+    원본은 한 번만 로드/인덱싱하고, 각 내보낸 파일은 최대 max_workers개의 스레드에서 분석합니다.
+    비교는 GIL을 잡는 파이썬 코드이므로 스레드는 파일 읽기만 겹칠 뿐 CPU 작업을 나눠 처리하지 못합니다.
+    내보낸 파일은 분석이 끝나면 보고서와 정규화된 어노테이션 값만 남기고 해제하므로,
+    레코드 전체가 메모리에 올라가는 내보낸 파일은 최대 max_workers개입니다.
+    어노테이터별 보고서와 함께 어노테이터 간 일치도를 담은 통합 보고서를 만듭니다.
+    """
+
+    AGREEMENT_FIELDS = ("keyword", "certainty")
+    MAX_HOTSPOTS = 50
+
+    def __init__(self, max_workers: int = 4,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 text_diff_budget: Optional[Dict[str, Any]] = None,
+                 text_diff_mode: str = "character",
+                 token_cache: Optional[TokenCache] = None):
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+        self.text_diff_budget = text_diff_budget
+        self.text_diff_mode = text_diff_mode
+        # Shared by every export so the original's tokenization is computed once
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        self._is_empty_value = JSONAnalyzer()._is_empty_value
+
+    def _new_analyzer(self, annotator: str = None) -> JSONAnalyzer:
+        callback = None
+        if self.progress_callback is not None:
+            def callback(event):
+                self.progress_callback({**event, "annotator": annotator})
+        return JSONAnalyzer(
+            progress_callback=callback,
+            text_diff_budget=self.text_diff_budget,
+            text_diff_mode=self.text_diff_mode,
+            token_cache=self.token_cache
+        )
+
+    def analyze_files(self, original_file: str, exported_files: Dict[str, str]) -> Dict[str, Any]:
+        """원본과 어노테이터별 내보낸 파일({어노테이터: 경로})을 비교 분석합니다.
+
+        반환값은 {"reports": {어노테이터: 보고서}, "consensus": 통합 보고서} 입니다.
+        """
+        loader = self._new_analyzer()
+        loader._report_progress("loading_original", force=True)
+        original = loader.load_jsonl_file(original_file)
+        orig_by_id = loader.index_records(original)
+        original_name = os.path.basename(original_file)
+
+        def analyze_export(annotator: str) -> Tuple[Dict[str, Any], Dict[Any, Dict[Tuple, Dict[str, Any]]]]:
+            analyzer = self._new_analyzer(annotator)
+            exported = analyzer.load_jsonl_file(exported_files[annotator])
+            exp_by_id = analyzer.index_records(exported)
+            report = analyzer.analyze_records(
+                original,
+                exported,
+                original_name,
+                os.path.basename(exported_files[annotator]),
+                orig_by_id=orig_by_id,
+                exp_by_id=exp_by_id
+            )
+            # Only the normalized annotations outlive this call; the export's records are released
+            annotations = {
+                data_id: self._annotation_values(record)
+                for data_id, record in exp_by_id.items() if data_id in orig_by_id
+            }
+            return report, annotations
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {annotator: pool.submit(analyze_export, annotator) for annotator in exported_files}
+            results = {annotator: future.result() for annotator, future in futures.items()}
+
+        reports = {annotator: report for annotator, (report, _) in results.items()}
+        annotations_by_annotator = {annotator: annotations for annotator, (_, annotations) in results.items()}
+
+        consensus = self.build_consensus(orig_by_id, annotations_by_annotator, reports)
+        consensus["metadata"]["original_file"] = original_name
+        consensus["metadata"]["exported_files"] = {
+            annotator: os.path.basename(path) for annotator, path in exported_files.items()
+        }
+        return {"reports": reports, "consensus": consensus}
+
+    def build_consensus(self, orig_by_id: Dict[Any, Dict],
+                        annotations_by_annotator: Dict[str, Dict[Any, Dict[Tuple, Dict[str, Any]]]],
+                        reports: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """어노테이터 간 레코드별 일치도, 태그별 kappa, 불일치 지점을 계산합니다.
+
+        annotations_by_annotator는 {어노테이터: {data_id: _annotation_values(레코드)}} 입니다.
+        """
+        annotators = sorted(annotations_by_annotator)
+        # Only records every annotator exported can be compared across annotators
+        shared_ids = [
+            data_id for data_id in orig_by_id
+            if all(data_id in annotations_by_annotator[annotator] for annotator in annotators)
+        ]
+
+        # ratings[(data_id, subject_id, tag)][field] = tuple of values, one per annotator
+        ratings: Dict[Tuple, Dict[str, Tuple]] = {}
+        record_agreement = {}
+        for data_id in shared_ids:
+            annotations = [annotations_by_annotator[annotator][data_id] for annotator in annotators]
+            items = set().union(*annotations)
+            for item in items:
+                ratings[(data_id,) + item] = {
+                    field: tuple(annotation.get(item, {}).get(field, ABSENT) for annotation in annotations)
+                    for field in self.AGREEMENT_FIELDS
+                }
+
+            pairs = list(combinations(range(len(annotators)), 2))
+            agreeing_pairs = sum(1 for a, b in pairs if annotations[a] == annotations[b])
+            record_agreement[data_id] = {
+                "unanimous": all(annotation == annotations[0] for annotation in annotations),
+                "pairwise_agreement": round(agreeing_pairs / len(pairs), 4) if pairs else 1.0,
+                "changed_by": [
+                    annotator for annotator in annotators
+                    if data_id in reports[annotator]["changes_by_record"]
+                ]
+            }
+
+        by_tag: Dict[str, List[Dict[str, Tuple]]] = {}
+        for (data_id, subject_id, tag), fields in ratings.items():
+            by_tag.setdefault(tag, []).append(fields)
+
+        tag_agreement = {}
+        for tag, items in sorted(by_tag.items()):
+            tag_agreement[tag] = {"items": len(items)}
+            for field in self.AGREEMENT_FIELDS:
+                field_ratings = [item[field] for item in items]
+                tag_agreement[tag][field] = {
+                    "observed_agreement": self.observed_agreement(field_ratings),
+                    "fleiss_kappa": self.fleiss_kappa(field_ratings),
+                    "pairwise_cohen_kappa": {
+                        f"{annotators[a]}|{annotators[b]}": self.cohen_kappa([(r[a], r[b]) for r in field_ratings])
+                        for a, b in combinations(range(len(annotators)), 2)
+                    }
+                }
+
+        hotspots = []
+        for (data_id, subject_id, tag), fields in ratings.items():
+            disagreement = max(1 - self._item_agreement(values) for values in fields.values())
+            if disagreement > 0:
+                hotspots.append({
+                    "data_id": data_id,
+                    "subject_id": subject_id,
+                    "tag": tag,
+                    "disagreement": round(disagreement, 4),
+                    "values": {
+                        field: dict(zip(annotators, values)) for field, values in fields.items()
+                    }
+                })
+        hotspots.sort(key=lambda h: (-h["disagreement"], str(h["data_id"]), str(h["subject_id"]), h["tag"]))
+
+        return {
+            "report_type": "consensus",
+            "metadata": {
+                "comparison_timestamp": datetime.now().isoformat(),
+                "annotators": annotators,
+                "total_records": len(orig_by_id),
+                "shared_records": len(shared_ids),
+                "agreement_fields": list(self.AGREEMENT_FIELDS)
+            },
+            "summary": {
+                "unanimous_records": sum(1 for r in record_agreement.values() if r["unanimous"]),
+                "disputed_items": len(hotspots),
+                "records_with_changes": {
+                    annotator: reports[annotator]["metadata"]["records_with_changes"] for annotator in annotators
+                },
+                "pii_annotation_changes": {
+                    annotator: reports[annotator]["summary"]["pii_annotation_changes"] for annotator in annotators
+                }
+            },
+            "record_agreement": record_agreement,
+            "tag_agreement": tag_agreement,
+            "disagreement_hotspots": hotspots[:self.MAX_HOTSPOTS]
+        }
+
+    def _annotation_values(self, record: Dict) -> Dict[Tuple, Dict[str, Any]]:
+        """레코드의 PII 어노테이션을 {(subject_id, tag): {field: 값}} 형태로 정규화합니다."""
+        values = {}
+        for subject in record.get('subjects', []):
+            for pii in subject.get('PIIs', []):
+                values[(subject['id'], pii['tag'])] = {
+                    field: self._normalize(pii.get(field)) for field in self.AGREEMENT_FIELDS
+                }
+        return values
+
+    def _normalize(self, value) -> Any:
+        # Empty keywords ("", "0", None) all mean "not annotated"
+        if self._is_empty_value(value):
+            return ""
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, (list, dict)):
+            # Ratings are counted as hashable categories
+            return json.dumps(value, sort_keys=True, ensure_ascii=False)
+        return value
+
+    @staticmethod
+    def _item_agreement(values: Tuple) -> float:
+        """한 항목에서 일치하는 평가자 쌍의 비율 (Fleiss의 P_i)."""
+        n = len(values)
+        if n < 2:
+            return 1.0
+        counts = Counter(values)
+        return (sum(c * c for c in counts.values()) - n) / (n * (n - 1))
+
+    @classmethod
+    def observed_agreement(cls, ratings: List[Tuple]) -> Optional[float]:
+        if not ratings:
+            return None
+        return round(sum(cls._item_agreement(values) for values in ratings) / len(ratings), 4)
+
+    @classmethod
+    def fleiss_kappa(cls, ratings: List[Tuple]) -> Optional[float]:
+        """항목별 평가값 튜플 목록으로 Fleiss' kappa를 계산합니다.
+
+        모든 평가가 한 범주에 몰려 기대 일치도가 1이면 정의되지 않으므로 None을 반환합니다.
+        """
+        if not ratings or len(ratings[0]) < 2:
+            return None
+
+        raters = len(ratings[0])
+        category_totals = Counter()
+        for values in ratings:
+            category_totals.update(values)
+
+        total = len(ratings) * raters
+        expected = sum((count / total) ** 2 for count in category_totals.values())
+        if expected >= 1:
+            return None
+
+        observed = sum(cls._item_agreement(values) for values in ratings) / len(ratings)
+        return round((observed - expected) / (1 - expected), 4)
+
+    @staticmethod
+    def cohen_kappa(pairs: List[Tuple[Any, Any]]) -> Optional[float]:
+        """두 평가자의 (a, b) 평가 쌍 목록으로 Cohen's kappa를 계산합니다."""
+        if not pairs:
+            return None
+
+        n = len(pairs)
+        observed = sum(1 for a, b in pairs if a == b) / n
+        a_counts = Counter(a for a, _ in pairs)
+        b_counts = Counter(b for _, b in pairs)
+        expected = sum(a_counts[c] * b_counts.get(c, 0) for c in a_counts) / (n * n)
+        if expected >= 1:
+            return None
+        return round((observed - expected) / (1 - expected), 4)
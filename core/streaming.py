@@ -0,0 +1,73 @@
+import hashlib
+from typing import Dict, List, Any
+
+from core.lazy_record import LazyRecord
+
+
+class IncrementalJSONLReader:
+    """청크 단위로 도착하는 JSONL 데이터를 해싱, 라인 카운트, 검증하는 클래스
+
+    업로드 도중에 데이터를 받는 즉시 처리하므로 업로드가 끝났을 때
+    파일을 다시 읽지 않고 파싱 오류를 알려줄 수 있습니다. 레코드는 보관하지 않으며,
+    분석 작업은 디스크에 기록된 파일을 읽습니다.
+    """
+
+    MAX_ERRORS = 100
+
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+        self.bytes_received = 0
+        self.line_count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._pending: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """청크를 받아 완성된 라인들을 처리합니다."""
+        self.sha256.update(chunk)
+        self.bytes_received += len(chunk)
+
+        start = 0
+        newline = chunk.find(b'\n')
+        while newline != -1:
+            if self._pending:
+                self._pending.append(chunk[start:newline])
+                line = b''.join(self._pending)
+                self._pending = []
+            else:
+                line = chunk[start:newline]
+            self._consume_line(line)
+            start = newline + 1
+            newline = chunk.find(b'\n', start)
+
+        # Keep the incomplete tail until the next chunk arrives
+        if start < len(chunk):
+            self._pending.append(chunk[start:])
+
+    def finish(self) -> None:
+        """마지막 라인(개행 없이 끝나는 경우)을 처리합니다."""
+        if self._pending:
+            line = b''.join(self._pending)
+            self._pending = []
+            self._consume_line(line)
+
+    def _consume_line(self, raw_line: bytes) -> None:
+        """한 라인에서 metadata만 파싱하고 data_id 존재 여부를 검증합니다. 나머지 필드는 비교 시 디코딩됩니다."""
+        line = raw_line.strip()
+        if not line:
+            return
+
+        self.line_count += 1
+        try:
+            LazyRecord(line)
+        except KeyError:
+            self._add_error("metadata.data_id 필드가 없습니다.")
+        except Exception as e:
+            self._add_error(str(e))
+
+    def _add_error(self, message: str) -> None:
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"line": self.line_count, "error": message})
+
+    @property
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
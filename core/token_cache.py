@@ -0,0 +1,58 @@
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+
+class TokenCache:
+    """텍스트 해시를 키로 토큰화 결과를 보관하는 LRU 캐시
+
+    원본 문서의 토큰화는 문서마다 한 번만 계산되어, 여러 내보낸 파일과의 비교나
+    재분석에서 재사용됩니다. 여러 분석 스레드가 함께 사용할 수 있습니다.
+    """
+
+    # Words, single punctuation marks and whitespace runs; \w also covers Hangul
+    TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]|\s+')
+
+    def __init__(self, max_tokens: int = 5_000_000):
+        # Bounded by total cached tokens rather than entries, since documents vary widely in size
+        self.max_tokens = max_tokens
+        self._entries: "OrderedDict[bytes, Tuple[Tuple[str, ...], List[int]]]" = OrderedDict()
+        self._total_tokens = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def tokenize(self, text: str) -> Tuple[Tuple[str, ...], List[int]]:
+        """(토큰 튜플, 토큰 시작 문자 오프셋 목록)을 반환합니다. 오프셋의 마지막 값은 전체 길이입니다."""
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        tokens = tuple(self.TOKEN_PATTERN.findall(text))
+        offsets = list(accumulate(map(len, tokens), initial=0))
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (tokens, offsets)
+                self._total_tokens += len(tokens)
+                while self._total_tokens > self.max_tokens and len(self._entries) > 1:
+                    _, (evicted, _) = self._entries.popitem(last=False)
+                    self._total_tokens -= len(evicted)
+        return tokens, offsets
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "tokens": self._total_tokens,
+                "hits": self.hits,
+                "misses": self.misses
+            }
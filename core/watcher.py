@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import time
+import hashlib
+from typing import Dict, List, Any, Optional, Callable
+
+from core.analyzer import JSONAnalyzer
+from core.lazy_record import LazyRecord
+
+
+class ExportWatcher:
+    """감시 폴더에 들어오는 내보낸 파일을 원본과 짝지어 자동으로 분석하는 클래스
+
+    폴더는 mtime/크기를 주기적으로 확인(polling)하며, 값이 debounce 초 동안 그대로일 때만
+    쓰기가 끝난 것으로 보고 분석합니다. 레코드마다 원본/내보낸 라인의 지문(fingerprint)을
+    보관하므로, 내용이 같은 레코드는 다시 비교하지 않고 뒤에 추가된 라인만 새로 분석합니다.
+    """
+
+    def __init__(self, watch_dirs: List[str], originals_dir: str,
+                 export_pattern: str, original_template: str,
+                 reports_folder: str, state_dir: str,
+                 debounce: float = 10.0, poll_interval: float = 5.0,
+                 text_diff_budget: Optional[Dict[str, Any]] = None,
+                 text_diff_mode: str = "character",
+                 log: Callable[[str], None] = print):
+        self.watch_dirs = watch_dirs
+        self.originals_dir = originals_dir
+        # export_pattern must define a named group "key"; original_template uses {key}
+        self.export_pattern = re.compile(export_pattern)
+        self.original_template = original_template
+        self.reports_folder = reports_folder
+        self.state_dir = state_dir
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        # The analyzer's token cache lives as long as the daemon, so re-analyses reuse tokenizations
+        self.analyzer = JSONAnalyzer(text_diff_budget=text_diff_budget, text_diff_mode=text_diff_mode)
+        self.log = log
+
+        self._seen: Dict[str, tuple] = {}       # path -> (signature, first seen with that signature)
+        self._processed: Dict[str, tuple] = {}  # path -> (export signature, original signature)
+        self._missing_originals = set()
+        self._originals: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(self.reports_folder, exist_ok=True)
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    def run_forever(self) -> None:
+        self.log(f"감시 시작: {', '.join(self.watch_dirs)} (원본: {self.originals_dir})")
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.log(f"감시 중 오류: {e}")
+            time.sleep(self.poll_interval)
+
+    def poll_once(self) -> List[str]:
+        """감시 폴더를 한 번 확인하고, 안정화된 새 파일/변경된 파일을 분석합니다."""
+        now = time.monotonic()
+        processed = []
+
+        for watch_dir in self.watch_dirs:
+            if not os.path.isdir(watch_dir):
+                continue
+            for entry in os.scandir(watch_dir):
+                match = self.export_pattern.fullmatch(entry.name)
+                if not match or not entry.is_file():
+                    continue
+
+                stat = entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                seen = self._seen.get(entry.path)
+                if seen is None or seen[0] != signature:
+                    # New or still being written: wait until it stops changing
+                    self._seen[entry.path] = (signature, now)
+                    continue
+                if now - seen[1] < self.debounce:
+                    continue
+
+                key = match.group('key')
+                original_path = os.path.join(self.originals_dir, self.original_template.format(key=key))
+                if not os.path.isfile(original_path):
+                    if entry.path not in self._missing_originals:
+                        self.log(f"원본 파일 없음: {entry.name} -> {original_path}")
+                        self._missing_originals.add(entry.path)
+                    continue
+                self._missing_originals.discard(entry.path)
+
+                original_stat = os.stat(original_path)
+                versions = (signature, (original_stat.st_mtime_ns, original_stat.st_size))
+                if self._processed.get(entry.path) == versions:
+                    continue
+
+                self.process(entry.path, key, original_path)
+                self._processed[entry.path] = versions
+                processed.append(entry.path)
+
+        return processed
+
+    def session_id(self, key: str) -> str:
+        """보고서 파일 이름에 쓰이는 세션 ID (웹 앱의 /report/<session_id>)."""
+        return "watch-" + re.sub(r'[^A-Za-z0-9_.-]', '_', key)
+
+    def process(self, export_path: str, key: str, original_path: str) -> Dict[str, Any]:
+        """내보낸 파일 하나를 분석하여 보고서를 저장합니다. 바뀐 레코드만 다시 비교합니다."""
+        started = time.monotonic()
+        session_id = self.session_id(key)
+        report_path = os.path.join(self.reports_folder, f"report_{session_id}.json")
+        state_path = os.path.join(self.state_dir, f"{session_id}.state.json")
+
+        original = self._load_original(original_path)
+        state = self._load_state(state_path, report_path)
+        # Previous per-record results, reused whenever both fingerprints still match
+        cache = state["records"] if state else {}
+
+        entries, offset, prefix_sha256, appended = self._read_export(export_path, state, original)
+        compared = 0
+        for data_id, entry in entries.items():
+            if "changes" in entry or data_id not in original["records"]:
+                continue
+            entry["orig_fp"] = original["fingerprints"][data_id]
+            previous = cache.get(data_id)
+            if previous and previous["exp_fp"] == entry["exp_fp"] and previous.get("orig_fp") == entry["orig_fp"]:
+                entry["changes"] = previous["changes"]
+            else:
+                entry["changes"] = self.analyzer.compare_record(original["records"][data_id], entry.pop("record"))
+                compared += 1
+            entry.pop("record", None)
+
+        report = self.analyzer.new_report(
+            os.path.basename(original_path),
+            os.path.basename(export_path),
+            original["line_count"]
+        )
+        report["metadata"]["source"] = "watch"
+        self.analyzer.set_id_changes(report, original["records"].keys(), entries.keys())
+        for data_id in original["records"]:
+            entry = entries.get(data_id)
+            if entry is not None and "changes" in entry:
+                self.analyzer.add_record_changes(report, data_id, entry["changes"])
+        self.analyzer.save_report(report, report_path)
+
+        self._save_state(state_path, {
+            "export_file": os.path.basename(export_path),
+            "text_diff_mode": self.analyzer.text_diff_mode,
+            "original_signature": original["signature"],
+            "offset": offset,
+            "prefix_sha256": prefix_sha256,
+            "records": [[data_id, entry["exp_fp"], entry.get("orig_fp")] for data_id, entry in entries.items()]
+        })
+
+        self.log(
+            f"분석 완료: {os.path.basename(export_path)} -> {os.path.basename(report_path)} "
+            f"({'추가분만' if appended else '전체'} 읽음, {compared}개 레코드 비교, {time.monotonic() - started:.1f}초)"
+        )
+        return report
+
+    def _read_export(self, export_path: str, state: Optional[Dict[str, Any]], original: Dict[str, Any]):
+        """내보낸 파일을 읽어 {data_id: 항목}을 만듭니다.
+
+        원본이 그대로이고 이전에 읽은 부분(prefix)의 해시가 같으면 그 뒤에 추가된 라인만 파싱합니다.
+        """
+        sha = hashlib.sha256()
+        entries: Dict[Any, Dict[str, Any]] = {}
+        appended = False
+
+        with open(export_path, 'rb') as f:
+            if state and state["original_signature"] == original["signature"]:
+                remaining = state["offset"]
+                while remaining > 0:
+                    block = f.read(min(1 << 20, remaining))
+                    if not block:
+                        break
+                    sha.update(block)
+                    remaining -= len(block)
+                appended = remaining == 0 and sha.hexdigest() == state["prefix_sha256"]
+
+            if appended:
+                entries = {
+                    data_id: {"exp_fp": entry["exp_fp"], "orig_fp": entry["orig_fp"], "changes": entry["changes"]}
+                    if "changes" in entry else {"exp_fp": entry["exp_fp"]}
+                    for data_id, entry in state["records"].items()
+                }
+                offset = state["offset"]
+            else:
+                f.seek(0)
+                sha = hashlib.sha256()
+                offset = 0
+
+            for line in f:
+                if line.endswith(b'\n'):
+                    # Only newline-terminated lines count as read; a trailing
+                    # partial line is parsed again after the next append.
+                    sha.update(line)
+                    offset += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                record = LazyRecord(line)
+                entries[record.data_id] = {
+                    "exp_fp": record.digest.hex(),
+                    "record": record
+                }
+
+        return entries, offset, sha.hexdigest(), appended
+
+    def _load_original(self, original_path: str) -> Dict[str, Any]:
+        """원본 파일을 로드하고 레코드별 지문을 계산합니다. 파일이 바뀌지 않았으면 캐시를 씁니다."""
+        stat = os.stat(original_path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cached = self._originals.get(original_path)
+        if cached and cached["signature"] == signature:
+            return cached
+
+        records, fingerprints, line_count = {}, {}, 0
+        with open(original_path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                line_count += 1
+                record = LazyRecord(line)
+                records[record.data_id] = record
+                fingerprints[record.data_id] = record.digest.hex()
+
+        original = {"signature": signature, "records": records, "fingerprints": fingerprints, "line_count": line_count}
+        self._originals[original_path] = original
+        return original
+
+    def _load_state(self, state_path: str, report_path: str) -> Optional[Dict[str, Any]]:
+        """이전 실행 상태를 복원합니다. 레코드별 비교 결과는 저장된 보고서에서 다시 읽습니다."""
+        if not (os.path.exists(state_path) and os.path.exists(report_path)):
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            with open(report_path, 'r', encoding='utf-8') as f:
+                changes_by_record = json.load(f)["changes_by_record"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if state.get("text_diff_mode", "character") != self.analyzer.text_diff_mode:
+            # Cached changes were recorded in another diff format
+            return None
+
+        records = {}
+        for data_id, exp_fp, orig_fp in state["records"]:
+            entry = {"exp_fp": exp_fp}
+            if orig_fp is not None:
+                entry["orig_fp"] = orig_fp
+                # Report keys are strings after JSON round-trip; unchanged records are not stored
+                entry["changes"] = changes_by_record.get(str(data_id)) or self.analyzer.unchanged_record()
+            records[data_id] = entry
+        state["records"] = records
+        return state
+
+    def _save_state(self, state_path: str, state: Dict[str, Any]) -> None:
+        tmp_path = state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, state_path)
@@ -0,0 +1,38 @@
+"""
+gunicorn 설정 - 운영 서버 실행: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+import sys
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Chunked uploads, SSE progress and the analysis queue live in the web worker's memory,
+# so exactly one worker is allowed (see on_starting); scale with WEB_THREADS instead.
+# CPU-heavy analyses run in the analysis executor's processes (ANALYSIS_WORKERS), not here.
+workers = int(os.getenv('WEB_WORKERS', '1'))
+worker_class = 'gthread'
+# Every open SSE progress stream holds one thread
+threads = int(os.getenv('WEB_THREADS', '32'))
+
+# Heartbeat timeout of the worker; gthread request threads may run longer (SSE, synchronous /upload)
+timeout = int(os.getenv('WEB_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    """웹 워커가 둘 이상이면 시작하지 않습니다. (-w 옵션으로 덮어쓴 경우 포함)
+
+    두 워커가 같은 업로드의 청크를 받으면 서로 다른 next_index로 파일을 잘라 쓰게 되어
+    업로드가 조용히 손상되고, 진행 상황 스트림도 분석을 실행한 워커에서만 볼 수 있습니다.
+    """
+    if server.cfg.workers != 1:
+        server.log.error(
+            "workers=%s (WEB_WORKERS / -w): chunked upload state and progress streams are per process; run one worker "
+            "and raise WEB_THREADS / ANALYSIS_WORKERS instead", server.cfg.workers
+        )
+        sys.exit(1)
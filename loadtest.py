@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+JSON Annotation Validator - 부하 테스트
+분석 요청(POST /upload)을 계속 보내면서 보고서 열람 요청의 지연 시간 백분위수를 측정합니다.
+분석이 진행되는 동안에도 보고서 열람이 빠르게 응답하는지 확인하는 용도입니다.
+"""
+
+import os
+import time
+import uuid
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='분석 중 보고서 열람 지연 시간 측정')
+    parser.add_argument('--url', default='http://localhost:5000',
+                        help='서버 주소')
+    parser.add_argument('--report', action='append', default=[],
+                        help='열람할 보고서 세션 ID (여러 번 지정 가능). 없으면 /reports 목록을 요청합니다.')
+    parser.add_argument('--original',
+                        help='분석 요청에 사용할 원본 파일')
+    parser.add_argument('--exported',
+                        help='분석 요청에 사용할 내보낸 파일')
+    parser.add_argument('--viewers', type=int, default=8,
+                        help='보고서를 반복 열람하는 동시 클라이언트 수')
+    parser.add_argument('--analyses', type=int, default=2,
+                        help='분석을 반복 요청하는 동시 클라이언트 수 (--original/--exported 필요)')
+    parser.add_argument('--duration', type=float, default=30.0,
+                        help='측정 시간(초)')
+    parser.add_argument('--timeout', type=float, default=600.0,
+                        help='요청 제한 시간(초)')
+    return parser.parse_args()
+
+
+def multipart_body(files):
+    """{필드 이름: (파일 이름, 바이트)}를 multipart/form-data 본문으로 만듭니다."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for field, (filename, data) in files.items():
+        parts.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode('utf-8')
+        )
+        parts.append(data)
+        parts.append(b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def percentile(sorted_values, p):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[rank - 1]
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.deadline = 0.0
+        self.latencies = defaultdict(list)  # endpoint -> seconds
+        self.statuses = defaultdict(Counter)  # endpoint -> status code counts
+        self._lock = threading.Lock()
+
+    def request(self, endpoint, url, data=None, headers=None):
+        request = urllib.request.Request(url, data=data, headers=headers or {})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.args.timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        except (urllib.error.URLError, OSError) as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            self.statuses[endpoint][status] += 1
+        return status
+
+    def viewer(self, n):
+        paths = [f"/report/{session_id}" for session_id in self.args.report] or ['/reports']
+        i = n
+        while time.monotonic() < self.deadline:
+            path = paths[i % len(paths)]
+            self.request('view', self.args.url + path)
+            i += 1
+
+    def analyzer(self, body, content_type):
+        while time.monotonic() < self.deadline:
+            status = self.request('analyze', self.args.url + '/upload', body, {'Content-Type': content_type})
+            if status == 429:
+                # Back off like a well-behaved client would on a full queue
+                time.sleep(1.0)
+
+    def run(self):
+        args = self.args
+        threads = [threading.Thread(target=self.viewer, args=(n,), daemon=True) for n in range(args.viewers)]
+
+        if args.analyses and args.original and args.exported:
+            files = {}
+            for field, path in (('original_file', args.original), ('exported_file', args.exported)):
+                with open(path, 'rb') as f:
+                    files[field] = (os.path.basename(path), f.read())
+            body, content_type = multipart_body(files)
+            threads += [
+                threading.Thread(target=self.analyzer, args=(body, content_type), daemon=True)
+                for _ in range(args.analyses)
+            ]
+
+        started = time.monotonic()
+        self.deadline = started + args.duration
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            # In-flight analyses may outlast the deadline
+            thread.join(max(0.0, self.deadline - time.monotonic()) + args.timeout)
+        return time.monotonic() - started
+
+    def print_summary(self, elapsed):
+        header = f"{'endpoint':<10}{'count':>8}{'req/s':>8}" + ''.join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}  status"
+        print(header)
+        print('-' * len(header))
+        for endpoint in ('view', 'analyze'):
+            values = sorted(self.latencies.get(endpoint, []))
+            if not values:
+                continue
+            row = f"{endpoint:<10}{len(values):>8}{len(values) / elapsed:>8.1f}"
+            row += ''.join(f"{percentile(values, p) * 1000:>8.0f}ms" for p in PERCENTILES)
+            row += f"{values[-1] * 1000:>8.0f}ms"
+            statuses = ', '.join(f"{status}: {count}" for status, count in sorted(self.statuses[endpoint].items(), key=str))
+            print(f"{row}  {statuses}")
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    load_test = LoadTest(args)
+    print(f"{args.url} - 열람 {args.viewers}개, 분석 {args.analyses if args.original and args.exported else 0}개 클라이언트, {args.duration:.0f}초")
+    elapsed = load_test.run()
+    load_test.print_summary(elapsed)
@@ -0,0 +1,82 @@
+import json
+
+from core.analyzer import JSONAnalyzer
+
+
+def record(data_id, text="hello world", subjects=None, **metadata):
+    return {
+        "metadata": {"provenance": {"data_id": "upstream"}, "data_id": data_id, **metadata},
+        "text": text,
+        "subjects": subjects if subjects is not None else [
+            {"id": 1, "description": "d", "PIIs": [{"tag": "NAME", "keyword": "Kim", "certainty": "high"}]}
+        ]
+    }
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records), encoding='utf-8')
+    return str(path)
+
+
+def sample_files(tmp_path):
+    original = [record(i * 1.5) for i in range(40)]
+    exported = [dict(r) for r in original[2:]]
+    exported[0] = record(3.0, text="hello there world")
+    exported[1] = record(4.5, subjects=[{"id": 1, "description": "changed", "PIIs": []}, {"id": 2, "description": "new", "PIIs": []}])
+    exported.append(record(1000.5))
+    return write_jsonl(tmp_path / "o.jsonl", original), write_jsonl(tmp_path / "e.jsonl", exported)
+
+
+def test_preview_of_whole_file_matches_full_report(tmp_path):
+    original, exported = sample_files(tmp_path)
+    analyzer = JSONAnalyzer()
+    full = analyzer.analyze_files(original, exported)
+    preview = analyzer.preview_files(original, exported, sample_size=1000, seed=1)
+
+    assert preview["summary"] == full["summary"]
+    assert preview["metadata"]["records_with_changes"] == full["metadata"]["records_with_changes"]
+    assert preview["id_changes"] == full["id_changes"]
+
+
+def test_preview_id_changes_use_metadata_data_id(tmp_path):
+    original, exported = sample_files(tmp_path)
+    preview = JSONAnalyzer().preview_files(original, exported, sample_size=5, seed=1)
+
+    assert preview["id_changes"]["missing_in_exported"] == [0.0, 1.5]
+    assert preview["id_changes"]["added_in_exported"] == [1000.5]
+    assert preview["metadata"]["total_records"] == 40
+
+
+def long_texts(words=10000):
+    original = ' '.join(f"word{i % 97}" for i in range(words))
+    return original, original.replace("word5 ", "WORD5 ", 3)
+
+
+def test_text_diff_skips_granularities_estimated_over_time_limit():
+    original, exported = long_texts()
+    analyzer = JSONAnalyzer(text_diff_budget={"time_limit": 0.5})
+    analyzer.text_diff_cost.update(character=1.0, word=1e-9)
+
+    changes = analyzer.analyze_text_differences(original, exported)
+
+    assert changes["granularity"] == "word"
+    assert changes["fallback_reason"] == "time_limit"
+
+
+def test_text_diff_over_time_limit_is_reported():
+    original, exported = long_texts()
+    analyzer = JSONAnalyzer(text_diff_budget={"time_limit": 0.01})
+    # An estimate that always fits, so the detailed diff runs and overruns the limit
+    analyzer.text_diff_cost = dict.fromkeys(analyzer.text_diff_cost, 0.0)
+
+    changes = analyzer.analyze_text_differences(original, exported)
+
+    assert changes["granularity"] == "character"
+    assert changes["fallback_reason"] == "time_limit"
+    assert analyzer.text_diff_cost["character"] > 0
+
+
+def test_short_text_diff_has_no_fallback():
+    changes = JSONAnalyzer().analyze_text_differences("hello world", "hello there world")
+    assert changes["granularity"] == "character"
+    assert "fallback_reason" not in changes
@@ -0,0 +1,74 @@
+import hashlib
+
+import pytest
+
+from app.chunked_upload import ChunkedUploadStore, UploadError
+
+
+def upload(store, session_id, role, data):
+    state = store.init_upload(session_id, role, f"{role}.jsonl", len(data))
+    store.write_chunk(state["session_id"], role, 0, data)
+    return state["session_id"]
+
+
+def test_annotator_roles_share_one_session(tmp_path):
+    store = ChunkedUploadStore(str(tmp_path), chunk_size=1024)
+    line = b'{"metadata": {"data_id": "1"}}\n'
+    session_id = upload(store, None, 'original', line)
+    for role in ('exported_alice', 'exported_bob'):
+        upload(store, session_id, role, line)
+
+    assert store.roles(session_id) == ['exported_alice', 'exported_bob', 'original']
+    assert store.get(session_id, 'exported_bob').complete
+
+    store.discard(session_id)
+    # Restored from the manifest after the in-memory state is released
+    assert store.get(session_id, 'exported_alice').complete
+
+
+@pytest.mark.parametrize("role", ['exported_', 'exported_../x', 'exported_a b', 'annotator', 'exported_' + 'a' * 65])
+def test_invalid_roles_are_rejected(tmp_path, role):
+    store = ChunkedUploadStore(str(tmp_path), chunk_size=1024)
+    with pytest.raises(UploadError):
+        store.init_upload(None, role, 'x.jsonl', 1)
+
+
+def test_lines_are_validated_across_chunks(tmp_path):
+    store = ChunkedUploadStore(str(tmp_path), chunk_size=8)
+    data = b'{"metadata": {"data_id": "1"}}\n{"metadata": {}}\nnot json\n'
+    state = store.init_upload(None, 'original', 'original.jsonl', len(data))
+    for index in range(state['total_chunks']):
+        store.write_chunk(state['session_id'], 'original', index, data[index * 8:(index + 1) * 8])
+
+    reader = store.get(state['session_id'], 'original').reader
+    assert reader.line_count == 3
+    assert [error['line'] for error in reader.errors] == [2, 3]
+
+
+def test_upload_resumes_after_restart(tmp_path):
+    data = b''.join(b'{"metadata": {"data_id": "%d"}}\n' % i for i in range(10)) + b'not json\n'
+    store = ChunkedUploadStore(str(tmp_path), chunk_size=16)
+    state = store.init_upload(None, 'exported', 'exported.jsonl', len(data))
+    session_id = state['session_id']
+    for index in range(3):
+        store.write_chunk(session_id, 'exported', index, data[index * 16:(index + 1) * 16])
+
+    # Crash after a chunk reached the file but before its manifest was saved
+    upload = store.get(session_id, 'exported')
+    with open(upload.path, 'ab') as f:
+        f.write(data[48:64])
+
+    restarted = ChunkedUploadStore(str(tmp_path), chunk_size=16)
+    state = restarted.init_upload(session_id, 'exported', 'exported.jsonl', len(data))
+    assert state['next_index'] == 3
+    assert state['received_bytes'] == 48
+
+    for index in range(state['next_index'], state['total_chunks']):
+        restarted.write_chunk(session_id, 'exported', index, data[index * 16:(index + 1) * 16])
+
+    upload = restarted.get(session_id, 'exported')
+    assert upload.complete
+    assert open(upload.path, 'rb').read() == data
+    assert upload.state()['sha256'] == hashlib.sha256(data).hexdigest()
+    assert upload.reader.line_count == 11
+    assert [error['line'] for error in upload.reader.errors] == [11]
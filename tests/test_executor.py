@@ -0,0 +1,47 @@
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.executor import AnalysisExecutor, QueueFull
+
+
+def crash(publish):
+    os._exit(1)
+
+
+def double(publish, value):
+    return value * 2
+
+
+def test_process_pool_is_rebuilt_after_a_worker_dies():
+    executor = AnalysisExecutor(max_workers=1, mode='process')
+    try:
+        with pytest.raises(BrokenProcessPool):
+            executor.submit('crashed', crash, on_event=lambda *_: None).result(timeout=60)
+
+        assert executor.submit('next', double, 21, on_event=lambda *_: None).result(timeout=60) == 42
+        assert executor.stats()["restarts"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_full_queue_rejects_with_retry_after():
+    executor = AnalysisExecutor(max_workers=1, max_pending=2, mode='thread')
+    release = threading.Event()
+    try:
+        for session_id in ('running', 'queued'):
+            executor.submit(session_id, lambda publish: release.wait(10), on_event=lambda *_: None)
+
+        with pytest.raises(QueueFull) as excinfo:
+            executor.submit('rejected', double, 1, on_event=lambda *_: None)
+        assert excinfo.value.retry_after > 0
+        assert executor.stats()["pending"] == 2
+        assert executor.stats()["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+    # Finished jobs free their slots
+    assert executor.stats()["pending"] == 0
@@ -0,0 +1,113 @@
+import json
+import random
+
+import pytest
+
+from core.lazy_record import LazyRecord
+
+
+def lazy(obj, **dumps_kwargs):
+    return LazyRecord(json.dumps(obj, **dumps_kwargs).encode('utf-8'))
+
+
+def test_data_id_from_metadata_not_nested_keys():
+    record = lazy({"metadata": {"provenance": {"data_id": "WRONG"}, "data_id": "RIGHT"}})
+    assert record.data_id == "RIGHT"
+
+
+def test_data_id_ignores_keys_before_metadata():
+    record = lazy({
+        "subjects": [{"data_id": 1, "tags": {"data_id": 2}}],
+        "text": '"data_id": 3',
+        "metadata": {"data_id": 4}
+    })
+    assert record.data_id == 4
+
+
+@pytest.mark.parametrize("data_id", [12.5, -7, 0, 1e21, "a\"b\\c", "한글 id", " ", True])
+def test_non_integer_and_escaped_ids(data_id):
+    assert lazy({"metadata": {"data_id": data_id}}).data_id == data_id
+    assert lazy({"metadata": {"data_id": data_id}}, ensure_ascii=False).data_id == data_id
+
+
+def test_missing_data_id():
+    for obj in ({}, {"metadata": {}}, {"metadata": []}, {"metadata": "x"}, {"text": "t"}):
+        with pytest.raises(KeyError):
+            lazy(obj)
+
+
+def test_not_an_object():
+    with pytest.raises(ValueError):
+        LazyRecord(b'[1, 2]')
+
+
+def test_string_escapes_and_brackets_in_values():
+    obj = {
+        "text": 'ends with backslash \\',
+        "quote": 'say "hi" } ] {',
+        "nested": {"a": ["}", "]", {"b": "\\\"{"}], "c": {}},
+        "metadata": {"data_id": "x"},
+        "after": [[], {}, [{}]]
+    }
+    for kwargs in ({}, {"ensure_ascii": False}, {"separators": (',', ':')}, {"indent": None}):
+        record = lazy(obj, **kwargs)
+        assert record.to_dict() == obj
+        assert list(record) == list(obj)
+
+
+def test_whitespace_between_tokens():
+    raw = b'  { "metadata" :\t{ "data_id" : 5 } , "text" : "a" ,"n": null , "e" : [ ] }  '
+    record = LazyRecord(raw)
+    assert record.data_id == 5
+    assert record.to_dict() == json.loads(raw)
+
+
+def test_raw_value_and_same_value():
+    a = lazy({"metadata": {"data_id": 1}, "text": "same", "subjects": [1]})
+    b = lazy({"subjects": [2], "text": "same", "metadata": {"data_id": 1}})
+    assert a.raw_value("text") == b'"same"'
+    assert a.raw_value("missing") is None
+    assert LazyRecord.same_value(a, b, "text")
+    assert not LazyRecord.same_value(a, b, "subjects")
+    assert not LazyRecord.same_value(a, {"text": "same"}, "text")
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(9 if depth < 3 else 5)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randint(-10 ** 6, 10 ** 6)
+    if kind == 2:
+        return rng.uniform(-1e3, 1e3)
+    if kind in (3, 4):
+        alphabet = 'ab "\\/{}[]:,\n\t한글 \x00'
+        return ''.join(rng.choice(alphabet) for _ in range(rng.randrange(8)))
+    if kind in (5, 6):
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return random_object(rng, depth + 1)
+
+
+def random_object(rng, depth):
+    keys = ["data_id", "metadata", "text", "k", "\"q\"", "한"]
+    return {rng.choice(keys): random_value(rng, depth) for _ in range(rng.randrange(4))}
+
+
+def test_fuzz_against_json_loads():
+    rng = random.Random(1234)
+    for _ in range(3000):
+        obj = random_object(rng, 1)
+        metadata = random_object(rng, 2)
+        metadata["data_id"] = random_value(rng, 3)
+        if isinstance(metadata["data_id"], (list, dict)):
+            metadata["data_id"] = rng.randint(0, 100)
+        obj["metadata"] = metadata
+        items = list(obj.items())
+        rng.shuffle(items)
+        obj = dict(items)
+
+        kwargs = rng.choice([{}, {"ensure_ascii": False}, {"separators": (',', ':')}])
+        raw = json.dumps(obj, **kwargs).encode('utf-8')
+        record = LazyRecord(raw)
+        assert record.data_id == json.loads(raw)["metadata"]["data_id"]
+        assert record.to_dict() == json.loads(raw)
@@ -0,0 +1,73 @@
+import json
+
+from core.multi_analyzer import MultiAnnotatorAnalyzer
+
+
+def record(data_id, keyword="Kim", certainty="high"):
+    return {
+        "metadata": {"data_id": data_id},
+        "text": "Kim lives in Seoul",
+        "subjects": [{"id": 1, "description": "d", "PIIs": [{"tag": "NAME", "keyword": keyword, "certainty": certainty, "hardness": "easy"}]}]
+    }
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in records), encoding='utf-8')
+    return str(path)
+
+
+def analyze(tmp_path, max_workers):
+    original = write_jsonl(tmp_path / "o.jsonl", [record(i) for i in range(4)])
+    exported = {
+        "a": write_jsonl(tmp_path / "a.jsonl", [record(i) for i in range(4)]),
+        "b": write_jsonl(tmp_path / "b.jsonl", [record(0, keyword="Lee"), record(1), record(2), record(3)]),
+        # Record 3 was dropped by annotator c, so it cannot be compared across annotators
+        "c": write_jsonl(tmp_path / "c.jsonl", [record(0), record(1, certainty="low"), record(2)])
+    }
+    return MultiAnnotatorAnalyzer(max_workers=max_workers).analyze_files(original, exported)
+
+
+def test_consensus_from_normalized_annotations(tmp_path):
+    consensus = analyze(tmp_path, max_workers=1)["consensus"]
+
+    assert consensus["metadata"]["shared_records"] == 3
+    agreement = consensus["record_agreement"]
+    assert agreement[2] == {"unanimous": True, "pairwise_agreement": 1.0, "changed_by": []}
+    assert agreement[0]["unanimous"] is False
+    assert agreement[0]["changed_by"] == ["b"]
+    assert round(agreement[1]["pairwise_agreement"], 4) == 0.3333
+    assert {(h["data_id"], h["tag"]) for h in consensus["disagreement_hotspots"]} == {(0, "NAME"), (1, "NAME")}
+
+
+def test_consensus_does_not_depend_on_worker_count(tmp_path):
+    def strip(result):
+        for report in [result["consensus"], *result["reports"].values()]:
+            report["metadata"].pop("comparison_timestamp")
+        return result
+
+    assert strip(analyze(tmp_path, max_workers=1)) == strip(analyze(tmp_path, max_workers=3))
+
+
+def test_fleiss_kappa_matches_the_standard_example():
+    # Fleiss (1971) table as reproduced on Wikipedia: 10 items, 14 raters, 5 categories, kappa = 0.210
+    counts = [
+        [0, 0, 0, 0, 14], [0, 2, 6, 4, 2], [0, 0, 3, 5, 6], [0, 3, 9, 2, 0], [2, 2, 8, 1, 1],
+        [7, 7, 0, 0, 0], [3, 2, 6, 3, 0], [2, 5, 3, 2, 2], [6, 5, 2, 1, 0], [0, 2, 2, 3, 7]
+    ]
+    ratings = [tuple(c for c, n in enumerate(row) for _ in range(n)) for row in counts]
+
+    assert MultiAnnotatorAnalyzer.fleiss_kappa(ratings) == 0.2099
+    assert MultiAnnotatorAnalyzer.observed_agreement(ratings) == 0.3780
+
+
+def test_cohen_kappa_known_values():
+    # 20 yes/yes, 5 yes/no, 10 no/yes, 15 no/no: p_o = 0.7, p_e = 0.5, kappa = 0.4
+    pairs = [("yes", "yes")] * 20 + [("yes", "no")] * 5 + [("no", "yes")] * 10 + [("no", "no")] * 15
+    assert MultiAnnotatorAnalyzer.cohen_kappa(pairs) == 0.4
+    assert MultiAnnotatorAnalyzer.cohen_kappa([("a", "a"), ("b", "b")]) == 1.0
+
+
+def test_kappa_is_undefined_without_variation():
+    assert MultiAnnotatorAnalyzer.fleiss_kappa([("x", "x", "x")] * 3) is None
+    assert MultiAnnotatorAnalyzer.cohen_kappa([("x", "x")] * 3) is None
+    assert MultiAnnotatorAnalyzer.fleiss_kappa([]) is None
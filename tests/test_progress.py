@@ -0,0 +1,50 @@
+import json
+
+from app.progress import ProgressBroker
+
+
+def read_events(stream):
+    events = []
+    for message in stream:
+        fields = dict(line.split(': ', 1) for line in message.strip().split('\n') if not line.startswith(':'))
+        if not fields:
+            continue
+        events.append((fields['event'], json.loads(fields['data'])))
+        if fields['event'] in ('done', 'error'):
+            return events
+    return events
+
+
+def test_preview_survives_later_progress():
+    broker = ProgressBroker()
+    broker.publish('s', 'progress', {'stage': 'queued'})
+    broker.publish('s', 'preview', {'preview': True})
+    broker.publish('s', 'progress', {'stage': 'loading_original'})
+    broker.publish('s', 'done', {'success': True})
+
+    events = read_events(broker.stream('s', heartbeat=0.01))
+
+    assert [event_type for event_type, _ in events] == ['preview', 'done']
+    assert events[0][1] == {'preview': True}
+
+
+def test_events_arrive_in_order_and_preview_is_sent_once():
+    broker = ProgressBroker()
+    stream = broker.stream('s', heartbeat=0.01)
+    broker.publish('s', 'preview', {'preview': True})
+    assert next(stream).startswith('id: 1\nevent: preview')
+
+    broker.publish('s', 'progress', {'stage': 'comparing', 'processed': 1})
+    broker.publish('s', 'progress', {'stage': 'comparing', 'processed': 2})
+    broker.publish('s', 'error', {'error': 'boom'})
+
+    # Only the latest progress event is kept; the preview already went out
+    assert read_events(stream) == [('error', {'error': 'boom'})]
+
+
+def test_idle_stream_sends_keep_alive():
+    broker = ProgressBroker()
+    broker.publish('s', 'progress', {'stage': 'queued'})
+    stream = broker.stream('s', heartbeat=0.01)
+    assert 'event: progress' in next(stream)
+    assert next(stream) == ": keep-alive\n\n"
@@ -0,0 +1,61 @@
+import os
+
+from app.retention import RetentionManager
+
+
+def make_upload(tmp_path, name, size):
+    path = tmp_path / name
+    path.mkdir()
+    (path / "data.jsonl").write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_pinned_upload_survives_sweep_over_budget(tmp_path):
+    retention = RetentionManager(str(tmp_path / "index.json"), disk_budget=100, ttl=3600, min_idle=0)
+    pinned = make_upload(tmp_path, "queued", 80)
+    idle = make_upload(tmp_path, "idle", 80)
+    retention.record(pinned, 'upload', 80)
+    retention.record(idle, 'upload', 80)
+    retention.pin(pinned)
+
+    result = retention.sweep()
+
+    assert os.path.exists(pinned)
+    assert result["evicted"] == [os.path.abspath(idle)]
+
+
+def test_unpinned_upload_is_evicted_again(tmp_path):
+    retention = RetentionManager(str(tmp_path / "index.json"), disk_budget=0, ttl=3600, min_idle=0)
+    upload = make_upload(tmp_path, "job", 10)
+    retention.record(upload, 'upload', 10)
+    retention.pin(upload)
+    retention.pin(upload)
+    retention.unpin(upload)
+    assert retention.sweep()["evicted"] == []
+
+    retention.unpin(upload)
+    assert retention.sweep()["evicted"] == [os.path.abspath(upload)]
+    assert not os.path.exists(upload)
+
+
+def test_adopt_untracked_registers_and_refreshes_external_reports(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    retention = RetentionManager(str(reports / ".retention_index.json"), disk_budget=10 ** 9, ttl=3600,
+                                 adopt_folders={'report': str(reports)})
+    report = reports / "report_watch-a.json"
+    report.write_text("{}")
+    (reports / "report_watch-b.json.tmp").write_text("{")
+
+    assert retention.adopt_untracked() == [str(report)]
+    assert retention.adopt_untracked() == []  # directory unchanged: not scanned again
+
+    report.write_text('{"changed": true}')
+    os.utime(report, (1_000_000, 1_000_000))
+    (reports / "report_watch-c.json").write_text("{}")
+    adopted = retention.adopt_untracked()
+
+    assert adopted == [str(reports / "report_watch-c.json")]
+    entries = dict(retention.entries('report'))
+    assert entries[str(report)]["size"] == len('{"changed": true}')
+    assert entries[str(report)]["modified"] == 1_000_000
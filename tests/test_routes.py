@@ -0,0 +1,123 @@
+import json
+import time
+import threading
+
+import pytest
+
+from app import create_app
+from app.routes import start_analysis_job
+
+
+SESSION_ID = '11111111-1111-1111-1111-111111111111'
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv('UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setenv('REPORTS_FOLDER', str(tmp_path / 'reports'))
+    monkeypatch.setenv('ANALYSIS_EXECUTOR', 'thread')
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def sse_events(response):
+    events = []
+    for chunk in response.response:
+        for message in chunk.decode('utf-8').split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in message.split('\n') if line and not line.startswith(':'))
+            if fields:
+                events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+        if events and events[-1][1] in ('done', 'error'):
+            return events
+    return events
+
+
+@pytest.mark.parametrize("body", [
+    {'role': 'original', 'filename': 'a.jsonl', 'size': None},
+    {'role': 'original', 'filename': 'a.jsonl', 'size': [1]},
+    {'role': 'original', 'filename': 'a.jsonl', 'size': 'large'},
+    {'role': 'original', 'filename': 3, 'size': 1},
+    [{'role': 'original'}],
+])
+def test_upload_init_rejects_malformed_body(client, body):
+    response = client.post('/api/upload/init', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_progress_stream_delivers_events_in_order(app, client):
+    subscribed = threading.Event()
+
+    def job(publish, session_id):
+        subscribed.wait(10)
+        publish('progress', {'stage': 'comparing', 'processed': 1, 'total': 2})
+        publish('preview', {'report_paths': [], 'summary': {'preview': True}})
+        publish('progress', {'stage': 'comparing', 'processed': 2, 'total': 2})
+        return {'report_paths': [], 'summary': {'success': True, 'session_id': session_id}}
+
+    start_analysis_job(app, SESSION_ID, job)
+    response = client.get(f'/api/progress/{SESSION_ID}', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    subscribed.set()
+    events = sse_events(response)
+
+    ids = [event_id for event_id, _, _ in events]
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert events[0][1:] == ('progress', {'stage': 'queued', 'processed': 0, 'total': 0})
+    assert ('preview', {'preview': True}) in [(name, data) for _, name, data in events]
+    assert events[-1][1:] == ('done', {'success': True, 'session_id': SESSION_ID})
+
+
+def test_failed_job_ends_stream_with_error(app, client):
+    def job(publish, session_id):
+        raise RuntimeError('boom')
+
+    start_analysis_job(app, SESSION_ID, job).exception(timeout=10)
+    events = sse_events(client.get(f'/api/progress/{SESSION_ID}', buffered=False))
+
+    assert [name for _, name, _ in events] == ['error']
+    assert 'boom' in events[0][2]['error']
+
+
+def test_progress_of_unknown_session_is_404(client):
+    assert client.get(f'/api/progress/{SESSION_ID}').status_code == 404
+
+
+def upload_pair(client, line=b'{"metadata": {"data_id": "1"}, "text": "t", "subjects": []}\n'):
+    session_id = None
+    for role in ('original', 'exported'):
+        state = client.post('/api/upload/init', json={
+            'role': role, 'filename': f'{role}.jsonl', 'size': len(line), 'session_id': session_id
+        }).get_json()
+        session_id = state['session_id']
+        assert client.put(f'/api/upload/{session_id}/{role}/chunk/0', data=line).status_code == 200
+    return session_id
+
+
+def test_complete_returns_429_with_retry_after_when_queue_is_full(app, client):
+    release = threading.Event()
+    executor = app.extensions['analysis_executor']
+    busy = [
+        executor.submit(f'busy-{n}', lambda publish: release.wait(10), on_event=lambda *_: None)
+        for n in range(executor.max_pending)
+    ]
+
+    session_id = upload_pair(client)
+    response = client.post(f'/api/upload/{session_id}/complete', json={})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+    assert response.get_json()['analysis']['rejected'] == 1
+
+    release.set()
+    for future in busy:
+        future.result(timeout=10)
+    # Slots are freed by the futures' done callbacks, which may run just after result() returns
+    deadline = time.monotonic() + 10
+    while executor.stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The uploads were kept, so the same session can be completed later
+    assert client.post(f'/api/upload/{session_id}/complete', json={}).status_code == 202
@@ -0,0 +1,93 @@
+import random
+
+from core.analyzer import JSONAnalyzer
+from core.token_cache import TokenCache
+
+WORDS = ["서울에", "부산에", "Kim", "lives", "in", "the", "a", ".", ",", " ", "  ", "\n", "데이터"]
+
+
+def apply_opcodes(orig_tokens, exp_tokens, opcodes):
+    """equal 구간은 원본에서, 변경 구간은 내보낸 토큰에서 가져와 내보낸 시퀀스를 다시 만듭니다."""
+    rebuilt, i = [], 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert i1 >= i
+        rebuilt.extend(orig_tokens[i:i1])
+        rebuilt.extend(exp_tokens[j1:j2])
+        i = i2
+    rebuilt.extend(orig_tokens[i:])
+    return tuple(rebuilt)
+
+
+def test_tokenize_round_trips_and_offsets():
+    cache = TokenCache()
+    text = "김철수는 서울에 산다. Kim  lives\tin Seoul!"
+    tokens, offsets = cache.tokenize(text)
+
+    assert "".join(tokens) == text
+    assert offsets[-1] == len(text)
+    assert all(text[offsets[n]:offsets[n + 1]] == token for n, token in enumerate(tokens))
+    assert "김철수는" in tokens and "!" in tokens
+
+
+def test_cache_hits_and_evicts_by_token_count():
+    cache = TokenCache(max_tokens=10)
+    first = cache.tokenize("a b c")
+    assert cache.tokenize("a b c")[0] is first[0]
+    assert cache.stats() == {"entries": 1, "tokens": 5, "hits": 1, "misses": 1}
+
+    cache.tokenize("d e f")
+    cache.tokenize("g h i")
+    # Least recently used entry goes first once the token budget is exceeded
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["tokens"] == 10
+    cache.tokenize("a b c")
+    assert cache.stats()["misses"] == 4
+
+    # A single document larger than the budget is still cached on its own
+    cache.tokenize("x " * 20)
+    assert cache.stats()["entries"] == 1
+
+
+def test_token_opcodes_reconstruct_exported_tokens():
+    analyzer = JSONAnalyzer(text_diff_mode="token")
+    rng = random.Random(7)
+    for _ in range(300):
+        orig_tokens = tuple(rng.choice(WORDS) for _ in range(rng.randint(0, 40)))
+        exp = list(orig_tokens)
+        for _ in range(rng.randint(0, 6)):
+            position = rng.randint(0, len(exp))
+            operation = rng.choice(("insert", "delete", "replace"))
+            if operation == "insert" or not exp:
+                exp.insert(position, rng.choice(WORDS))
+            elif operation == "delete":
+                del exp[min(position, len(exp) - 1)]
+            else:
+                exp[min(position, len(exp) - 1)] = rng.choice(WORDS)
+        exp_tokens = tuple(exp)
+
+        opcodes = analyzer._token_opcodes(orig_tokens, exp_tokens)
+
+        assert all(tag in ("insert", "delete", "replace") for tag, *_ in opcodes)
+        assert apply_opcodes(orig_tokens, exp_tokens, opcodes) == exp_tokens
+        if orig_tokens == exp_tokens:
+            assert opcodes == []
+
+
+def test_token_changes_spans_rebuild_exported_text():
+    analyzer = JSONAnalyzer(text_diff_mode="token")
+    original = "김철수는 서울에 산다. Kim lives in Seoul."
+    exported = "김철수는 부산에 산다. Kim lived in Seoul, Korea."
+
+    changes = analyzer.analyze_text_differences(original, exported)
+    assert changes["granularity"] == "token"
+
+    rebuilt, position = [], 0
+    for change in changes["token_changes"]:
+        fields = dict(zip(JSONAnalyzer.TOKEN_CHANGE_FIELDS, change))
+        orig_start, orig_end = fields["original_span"]
+        assert original[orig_start:orig_end] == fields["original_text"]
+        rebuilt.append(original[position:orig_start])
+        rebuilt.append(fields["exported_text"])
+        position = orig_end
+    rebuilt.append(original[position:])
+    assert "".join(rebuilt) == exported
@@ -0,0 +1,100 @@
+import json
+
+from core.analyzer import JSONAnalyzer
+from core.watcher import ExportWatcher
+
+
+def line(data_id, text="Kim lives in Seoul", keyword="Kim"):
+    record = {
+        "metadata": {"data_id": data_id},
+        "text": text,
+        "subjects": [{"id": 1, "description": "d", "PIIs": [{"tag": "NAME", "keyword": keyword, "certainty": "high", "hardness": "easy"}]}]
+    }
+    return json.dumps(record) + "\n"
+
+
+def make_watcher(tmp_path, logs):
+    return ExportWatcher(
+        [str(tmp_path / "watch")], str(tmp_path / "originals"), r"(?P<key>.+)\.export\.jsonl", "{key}.jsonl",
+        str(tmp_path / "reports"), str(tmp_path / "state"), log=logs.append
+    )
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    report["metadata"].pop("comparison_timestamp")
+    report["metadata"].pop("source", None)
+    report["metadata"].pop("exported_file")
+    return report
+
+
+def full_report(tmp_path, original, export):
+    path = tmp_path / "full.json"
+    analyzer = JSONAnalyzer()
+    analyzer.save_report(analyzer.analyze_files(str(original), str(export)), str(path))
+    return load_report(path)
+
+
+def setup_files(tmp_path):
+    (tmp_path / "watch").mkdir()
+    (tmp_path / "originals").mkdir()
+    original = tmp_path / "originals" / "batch.jsonl"
+    original.write_text("".join(line(i) for i in range(6)))
+    export = tmp_path / "watch" / "batch.export.jsonl"
+    export.write_text(line(0) + line(1, text="Kim lives in Busan") + line(2))
+    return original, export
+
+
+def count_comparisons(watcher):
+    calls = []
+    compare_record = watcher.analyzer.compare_record
+    watcher.analyzer.compare_record = lambda *args: calls.append(args) or compare_record(*args)
+    return calls
+
+
+def test_appended_lines_after_restart_match_a_full_run(tmp_path):
+    original, export = setup_files(tmp_path)
+    logs = []
+    watcher = make_watcher(tmp_path, logs)
+    report_path = tmp_path / "reports" / f"report_{watcher.session_id('batch')}.json"
+    watcher.process(str(export), "batch", str(original))
+
+    with open(export, "a") as f:
+        f.write(line(3, keyword="Lee") + line(4))
+
+    # A new watcher picks up the saved state and reads only the appended lines
+    restarted = make_watcher(tmp_path, logs)
+    calls = count_comparisons(restarted)
+    restarted.process(str(export), "batch", str(original))
+
+    assert len(calls) == 2
+    assert "추가분만" in logs[-1]
+    assert load_report(report_path) == full_report(tmp_path, original, export)
+
+
+def test_unchanged_export_is_not_compared_again_after_restart(tmp_path):
+    original, export = setup_files(tmp_path)
+    make_watcher(tmp_path, []).process(str(export), "batch", str(original))
+
+    restarted = make_watcher(tmp_path, [])
+    calls = count_comparisons(restarted)
+    restarted.process(str(export), "batch", str(original))
+
+    assert calls == []
+
+
+def test_rewritten_export_compares_only_changed_records(tmp_path):
+    original, export = setup_files(tmp_path)
+    logs = []
+    watcher = make_watcher(tmp_path, logs)
+    report_path = tmp_path / "reports" / f"report_{watcher.session_id('batch')}.json"
+    watcher.process(str(export), "batch", str(original))
+
+    export.write_text(line(0, keyword="Park") + line(1, text="Kim lives in Busan") + line(2))
+    calls = count_comparisons(watcher)
+    watcher.process(str(export), "batch", str(original))
+
+    assert len(calls) == 1
+    assert "전체" in logs[-1]
+    assert load_report(report_path) == full_report(tmp_path, original, export)
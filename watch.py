@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+JSON Annotation Validator - 감시 폴더 데몬
+감시 폴더에 내보낸 파일이 들어오면 원본과 짝지어 자동으로 분석하고,
+보고서를 웹 앱의 보고서 폴더에 저장합니다.
+"""
+
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.watcher import ExportWatcher
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='내보낸 파일 감시 및 자동 분석 데몬')
+    parser.add_argument('--watch', action='append', required=True,
+                        help='감시할 폴더 (여러 번 지정 가능)')
+    parser.add_argument('--originals', required=True,
+                        help='원본 파일이 있는 폴더')
+    parser.add_argument('--export-pattern', default=r'(?P<key>.+)\.jsonl',
+                        help='내보낸 파일 이름 정규식. 원본과 짝짓는 "key" 그룹이 있어야 합니다.')
+    parser.add_argument('--original-template', default='{key}.jsonl',
+                        help='key로 원본 파일 이름을 만드는 템플릿 (예: personapii_tab_144_{key}.jsonl)')
+    parser.add_argument('--reports', default=os.getenv('REPORTS_FOLDER', 'app/reports'),
+                        help='보고서 저장 폴더 (웹 앱의 REPORTS_FOLDER, 기본값은 같은 환경 변수)')
+    parser.add_argument('--state-dir', default='app/watch_state',
+                        help='증분 분석 상태 저장 폴더')
+    parser.add_argument('--debounce', type=float, default=10.0,
+                        help='파일 크기/mtime이 이 시간(초) 동안 그대로여야 분석합니다.')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='폴더 확인 주기(초)')
+    parser.add_argument('--text-diff-mode', choices=['character', 'token'], default='character',
+                        help='텍스트 비교 단위 (token: 토큰 범위 단위의 간결한 변경 기록)')
+    parser.add_argument('--once', action='store_true',
+                        help='한 번만 확인하고 종료합니다. (debounce 무시)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    watcher = ExportWatcher(
+        watch_dirs=args.watch,
+        originals_dir=args.originals,
+        export_pattern=args.export_pattern,
+        original_template=args.original_template,
+        reports_folder=args.reports,
+        state_dir=args.state_dir,
+        debounce=0.0 if args.once else args.debounce,
+        poll_interval=args.interval,
+        text_diff_mode=args.text_diff_mode
+    )
+
+    if args.once:
+        # First pass only records signatures; the second one analyzes
+        watcher.poll_once()
+        watcher.poll_once()
+    else:
+        watcher.run_forever()
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+JSON Annotation Validator - WSGI 진입점
+pre-fork WSGI 서버(gunicorn)에서 실행합니다: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Analyses run in separate worker processes so report pages stay responsive
+os.environ.setdefault('ANALYSIS_EXECUTOR', 'process')
+
+from app import create_app
+
+app = create_app()